@@ -1,16 +1,45 @@
+import functools
 import json
 import random
+import re
+import sys
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of preventive measures returned per incident
+_MAX_PREVENTION = 6
+
+# General preventive measures, in priority order
+_BASE_PREVENTION = (
+    'Implement automated health checks',
+    'Add comprehensive monitoring and alerting',
+    'Regular load testing and capacity planning',
+    'Implement graceful degradation mechanisms',
+    'Create detailed incident playbooks',
+    'Regular chaos engineering exercises'
+)
+
+# Preventive measures specific to a detected incident pattern
+_PATTERN_PREVENTION = MappingProxyType({
+    'high_cpu': (
+        'Implement auto-scaling based on CPU metrics',
+        'Add CPU usage alerts at 70% threshold'
+    ),
+    'memory_leak': (
+        'Implement memory usage monitoring',
+        'Regular service restarts during maintenance windows'
+    )
+})
+
 class AIAnalysisEngine:
     """Advanced AI Analysis Engine for SRE Operations"""
     
     def __init__(self):
-        self.incident_patterns = {
+        patterns = {
             'high_cpu': {
                 'keywords': ['cpu', 'processor', 'compute', 'high load'],
                 'solutions': ['Scale horizontally', 'Optimize queries', 'Add caching']
@@ -28,6 +57,14 @@ class AIAnalysisEngine:
                 'solutions': ['Check network configuration', 'Load balancer health', 'DNS resolution']
             }
         }
+        # Read-only pattern catalogue of interned keyword and solution tuples
+        self.incident_patterns = MappingProxyType({
+            name: MappingProxyType({
+                'keywords': tuple(sys.intern(kw) for kw in pattern_data['keywords']),
+                'solutions': tuple(sys.intern(solution) for solution in pattern_data['solutions'])
+            })
+            for name, pattern_data in patterns.items()
+        })
         
         self.severity_weights = {
             'critical': 1.0,
@@ -35,18 +72,90 @@ class AIAnalysisEngine:
             'medium': 0.6,
             'low': 0.4
         }
+        
+        # Predicted resolution windows in minutes per severity
+        self.mttr_ranges = {
+            'critical': (15, 45),
+            'high': (30, 90),
+            'medium': (60, 180),
+            'low': (120, 480)
+        }
+        
+        # Impact assessment and confidence only depend on a handful of
+        # discrete inputs, so every possible result is computed up front
+        self._impact_table = {
+            severity: self._compute_impact(weight)
+            for severity, weight in self.severity_weights.items()
+        }
+        self._default_impact = self._compute_impact(0.6)
+        self._confidence_table = {
+            (has_description, has_severity): self._compute_confidence(has_description, has_severity)
+            for has_description in (False, True)
+            for has_severity in (False, True)
+        }
+        
+        # Simulated correlation sources share one generator so every signal
+        # for an incident comes from a single batch of random bits
+        self._rng = random.Random()
+        self._dependencies = ('payment-gateway', 'email-service', 'auth-provider')
+        
+        # Parallel per-pattern arrays with keywords lowercased once and the
+        # confidence denominators precomputed
+        self._pattern_names = list(self.incident_patterns)
+        self._pattern_keywords = [
+            tuple(sys.intern(kw.lower()) for kw in pattern_data['keywords'])
+            for pattern_data in self.incident_patterns.values()
+        ]
+        self._pattern_inv_len = [1.0 / len(keywords) for keywords in self._pattern_keywords]
+        
+        self._build_keyword_matcher()
+        # Titles and descriptions are immutable strings, so detection results
+        # can be shared between calls for the same incident text
+        self._detect_patterns = functools.lru_cache(maxsize=1024)(self._scan_patterns)
+
+    def _build_keyword_matcher(self) -> None:
+        """Compile every pattern keyword into a single-pass text matcher"""
+        keywords = {kw for pattern_keywords in self._pattern_keywords for kw in pattern_keywords}
+        
+        # Longest alternatives first so each text position reports the longest
+        # keyword starting there; shorter keywords sharing that start are
+        # prefixes of it and are recovered through the cover map.
+        alternation = '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        self._keyword_regex = re.compile(f'(?=({alternation}))')
+        self._keyword_cover = {
+            kw: frozenset(other for other in keywords if kw.startswith(other))
+            for kw in keywords
+        }
+
+    def _match_keywords(self, text: str) -> set:
+        """Return every known keyword occurring anywhere in text"""
+        hits = set()
+        for match in self._keyword_regex.finditer(text):
+            hits |= self._keyword_cover[match.group(1)]
+        return hits
 
     def analyze_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Perform comprehensive AI analysis of incident"""
+        return self._analyze(incident_data, datetime.now().isoformat())
+
+    def analyze_incidents_batch(self, incidents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze many incidents, e.g. for retrospective reports"""
+        analysis_timestamp = datetime.now().isoformat()
+        return [self._analyze(incident_data, analysis_timestamp) for incident_data in incidents]
+
+    def _analyze(self, incident_data: Dict[str, Any], analysis_timestamp: str) -> Dict[str, Any]:
+        """Run every analysis stage for one incident"""
         try:
+            incident_data = self._normalize_incident(incident_data)
+            root_cause = self._analyze_root_cause(incident_data)
             analysis = {
                 'incident_id': incident_data.get('id'),
-                'analysis_timestamp': datetime.now().isoformat(),
-                'root_cause_analysis': self._analyze_root_cause(incident_data),
+                'analysis_timestamp': analysis_timestamp,
+                'root_cause_analysis': root_cause,
                 'impact_assessment': self._assess_impact(incident_data),
-                'recommended_actions': self._generate_recommendations(incident_data),
+                'recommended_actions': self._generate_recommendations(incident_data, root_cause),
                 'mttr_prediction': self._predict_mttr(incident_data),
-                'prevention_measures': self._suggest_prevention(incident_data),
+                'prevention_measures': self._suggest_prevention(incident_data, root_cause),
                 'correlation_analysis': self._analyze_correlations(incident_data),
                 'confidence_score': self._calculate_confidence(incident_data)
             }
@@ -58,23 +167,36 @@ class AIAnalysisEngine:
             logger.error(f"AI Analysis failed: {str(e)}")
             return self._fallback_analysis(incident_data)
 
+    def _normalize_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy incident data with lowercased severity and text added once"""
+        inc = dict(incident_data)
+        inc['_sev'] = inc.get('severity', 'medium').lower()
+        inc['_title_l'] = inc.get('title', '').lower()
+        inc['_desc_l'] = inc.get('description', '').lower()
+        return inc
+
+    def _severity(self, incident_data: Dict[str, Any]) -> str:
+        """Lowercased incident severity, normalized if not done already"""
+        severity = incident_data.get('_sev')
+        if severity is None:
+            severity = incident_data.get('severity', 'medium').lower()
+        return severity
+
     def _analyze_root_cause(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze potential root causes"""
-        title = incident_data.get('title', '').lower()
-        description = incident_data.get('description', '').lower()
-        
-        detected_patterns = []
-        for pattern_name, pattern_data in self.incident_patterns.items():
-            keyword_matches = sum(1 for keyword in pattern_data['keywords'] 
-                                if keyword in title or keyword in description)
-            if keyword_matches > 0:
-                confidence = min(keyword_matches / len(pattern_data['keywords']), 1.0)
-                detected_patterns.append({
-                    'pattern': pattern_name,
-                    'confidence': confidence,
-                    'matching_keywords': [kw for kw in pattern_data['keywords'] 
-                                      if kw in title or kw in description]
-                })
+        if '_title_l' not in incident_data:
+            incident_data = self._normalize_incident(incident_data)
+        
+        detected_patterns = [
+            {
+                'pattern': pattern_name,
+                'confidence': confidence,
+                'matching_keywords': list(matching_keywords)
+            }
+            for pattern_name, confidence, matching_keywords in self._detect_patterns(
+                incident_data['_title_l'], incident_data['_desc_l']
+            )
+        ]
         
         return {
             'primary_pattern': max(detected_patterns, key=lambda x: x['confidence']) if detected_patterns else None,
@@ -82,11 +204,26 @@ class AIAnalysisEngine:
             'analysis_method': 'pattern_matching_v2'
         }
 
+    def _scan_patterns(self, title: str, description: str) -> tuple:
+        """Detect incident patterns in lowercased title and description text"""
+        hits = self._match_keywords(f"{title}\n{description}")
+        
+        detected = []
+        for pattern_name, keywords, inv_len in zip(self._pattern_names, self._pattern_keywords,
+                                                   self._pattern_inv_len):
+            matching_keywords = tuple(kw for kw in keywords if kw in hits)
+            if matching_keywords:
+                detected.append((pattern_name, min(len(matching_keywords) * inv_len, 1.0), matching_keywords))
+        
+        return tuple(detected)
+
     def _assess_impact(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Assess business impact of incident"""
-        severity = incident_data.get('severity', 'medium').lower()
-        base_impact = self.severity_weights.get(severity, 0.6)
-        
+        severity = self._severity(incident_data)
+        return dict(self._impact_table.get(severity, self._default_impact))
+
+    def _compute_impact(self, base_impact: float) -> Dict[str, Any]:
+        """Compute the impact assessment for a severity weight"""
         # Simulate impact calculation based on severity and time
         time_factor = 1.0  # Could be enhanced with actual time data
         user_impact = base_impact * time_factor
@@ -98,9 +235,10 @@ class AIAnalysisEngine:
             'sla_impact': 'high' if user_impact > 0.7 else 'medium' if user_impact > 0.4 else 'low'
         }
 
-    def _generate_recommendations(self, incident_data: Dict[str, Any]) -> List[str]:
+    def _generate_recommendations(self, incident_data: Dict[str, Any],
+                                  root_cause: Optional[Dict[str, Any]] = None) -> List[str]:
         """Generate actionable recommendations"""
-        root_cause = self._analyze_root_cause(incident_data)
+        root_cause = root_cause or self._analyze_root_cause(incident_data)
         recommendations = []
         
         if root_cause['primary_pattern']:
@@ -109,7 +247,7 @@ class AIAnalysisEngine:
             recommendations.extend(pattern_data.get('solutions', []))
         
         # Add general recommendations based on severity
-        severity = incident_data.get('severity', 'medium').lower()
+        severity = self._severity(incident_data)
         if severity in ['critical', 'high']:
             recommendations.extend([
                 'Escalate to senior SRE team immediately',
@@ -117,20 +255,13 @@ class AIAnalysisEngine:
                 'Enable detailed logging for post-incident analysis'
             ])
         
-        return list(set(recommendations))  # Remove duplicates
+        return list(dict.fromkeys(recommendations))  # Remove duplicates, keep order
 
     def _predict_mttr(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict Mean Time To Resolution"""
-        severity = incident_data.get('severity', 'medium').lower()
-        base_mttr = {
-            'critical': (15, 45),  # 15-45 minutes
-            'high': (30, 90),      # 30-90 minutes
-            'medium': (60, 180),    # 1-3 hours
-            'low': (120, 480)       # 2-8 hours
-        }
-        
-        mttr_range = base_mttr.get(severity, (60, 180))
-        predicted_mttr = random.randint(mttr_range[0], mttr_range[1])
+        severity = self._severity(incident_data)
+        mttr_range = self.mttr_ranges.get(severity, (60, 180))
+        predicted_mttr = self._rng.randint(mttr_range[0], mttr_range[1])
         
         return {
             'predicted_mttr_minutes': predicted_mttr,
@@ -139,76 +270,47 @@ class AIAnalysisEngine:
             'prediction_accuracy': '85%'
         }
 
-    def _suggest_prevention(self, incident_data: Dict[str, Any]) -> List[str]:
+    def _suggest_prevention(self, incident_data: Dict[str, Any],
+                            root_cause: Optional[Dict[str, Any]] = None) -> List[str]:
         """Suggest preventive measures"""
-        prevention_measures = [
-            'Implement automated health checks',
-            'Add comprehensive monitoring and alerting',
-            'Regular load testing and capacity planning',
-            'Implement graceful degradation mechanisms',
-            'Create detailed incident playbooks',
-            'Regular chaos engineering exercises'
-        ]
-        
         # Add specific prevention based on incident type
-        root_cause = self._analyze_root_cause(incident_data)
-        if root_cause['primary_pattern']:
-            pattern = root_cause['primary_pattern']['pattern']
-            if pattern == 'high_cpu':
-                prevention_measures.extend([
-                    'Implement auto-scaling based on CPU metrics',
-                    'Add CPU usage alerts at 70% threshold'
-                ])
-            elif pattern == 'memory_leak':
-                prevention_measures.extend([
-                    'Implement memory usage monitoring',
-                    'Regular service restarts during maintenance windows'
-                ])
-        
-        return prevention_measures[:6]  # Return top 6 recommendations
+        root_cause = root_cause or self._analyze_root_cause(incident_data)
+        if not root_cause['primary_pattern']:
+            return list(_BASE_PREVENTION)
+        
+        specific = _PATTERN_PREVENTION.get(root_cause['primary_pattern']['pattern'], ())
+        return list(specific + _BASE_PREVENTION[:_MAX_PREVENTION - len(specific)])
 
     def _analyze_correlations(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze correlations with other system events"""
+        # Simulate deployment, traffic and system change checks from one draw
+        signals = self._rng.getrandbits(3)
+        # Simulate external dependency check
+        affected_dependencies = self._rng.sample(self._dependencies, self._rng.randint(0, 2))
+        
         return {
-            'recent_deployments': self._check_recent_deployments(),
-            'traffic_spikes': self._check_traffic_patterns(),
-            'system_changes': self._check_system_changes(),
-            'external_dependencies': self._check_external_dependencies(),
+            'recent_deployments': bool(signals & 1),
+            'traffic_spikes': bool(signals & 2),
+            'system_changes': bool(signals & 4),
+            'external_dependencies': affected_dependencies,
             'correlation_confidence': '78%'
         }
 
     def _calculate_confidence(self, incident_data: Dict[str, Any]) -> float:
         """Calculate overall confidence score for the analysis"""
+        return self._confidence_table[bool(incident_data.get('description')), bool(incident_data.get('severity'))]
+
+    def _compute_confidence(self, has_description: bool, has_severity: bool) -> float:
+        """Compute the confidence score for the available incident data"""
         factors = {
-            'data_completeness': 0.9 if incident_data.get('description') else 0.5,
+            'data_completeness': 0.9 if has_description else 0.5,
             'pattern_match_strength': 0.8,
             'historical_similarity': 0.7,
-            'severity_clarity': 0.9 if incident_data.get('severity') else 0.6
+            'severity_clarity': 0.9 if has_severity else 0.6
         }
         
         return round(sum(factors.values()) / len(factors), 2)
 
-    def _check_recent_deployments(self) -> bool:
-        """Check if there were recent deployments"""
-        # Simulate deployment check
-        return random.choice([True, False])
-
-    def _check_traffic_patterns(self) -> bool:
-        """Check for unusual traffic patterns"""
-        # Simulate traffic pattern analysis
-        return random.choice([True, False])
-
-    def _check_system_changes(self) -> bool:
-        """Check for recent system changes"""
-        # Simulate system change detection
-        return random.choice([True, False])
-
-    def _check_external_dependencies(self) -> List[str]:
-        """Check external dependency status"""
-        # Simulate external dependency check
-        dependencies = ['payment-gateway', 'email-service', 'auth-provider']
-        return random.sample(dependencies, random.randint(0, 2))
-
     def _fallback_analysis(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback analysis if AI engine fails"""
         return {
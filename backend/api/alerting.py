@@ -1,31 +1,164 @@
 import asyncio
-import json
+import collections
+import itertools
+import operator
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from types import MappingProxyType
+from email.message import EmailMessage
+import aiosmtplib
+import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Wording used in alert messages for each rule condition
+_CONDITION_MAP = MappingProxyType({
+    'greater_than': 'exceeded',
+    'less_than': 'fell below',
+    'equals': 'equals',
+    'not_equals': 'does not equal'
+})
+
+def _percentage_increase(value: float, threshold: float) -> bool:
+    """Trigger when value is more than 20% above the threshold"""
+    return (value / threshold - 1) * 100 > 20
+
+def _never(value: float, threshold: float) -> bool:
+    """Fallback for unknown conditions"""
+    return False
+
+# Comparison function for each rule condition
+_CONDITION_FNS = MappingProxyType({
+    'greater_than': operator.gt,
+    'less_than': operator.lt,
+    'equals': operator.eq,
+    'not_equals': operator.ne,
+    'percentage_increase': _percentage_increase
+})
+
+# Request headers for payloads pre-encoded with orjson
+_JSON_HEADERS = {'content-type': 'application/json'}
+
+# Slack attachment colors by alert severity
+_SEVERITY_COLOR = MappingProxyType({
+    'critical': 'danger',
+    'high': 'warning',
+    'medium': 'warning',
+    'low': 'good'
+})
+
+@dataclass(slots=True)
+class Alert:
+    """Alert raised by a rule; converted with to_dict() at the API boundary"""
+    id: str
+    rule_id: str
+    rule_name: str
+    severity: str
+    metric: str
+    current_value: float
+    threshold: float
+    condition: str
+    status: str
+    created_at: str
+    message: str
+    notification_sent: bool = False
+    acknowledged_at: Optional[str] = None
+    resolved_at: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the alert for API responses"""
+        data = {
+            'id': self.id,
+            'rule_id': self.rule_id,
+            'rule_name': self.rule_name,
+            'severity': self.severity,
+            'metric': self.metric,
+            'current_value': self.current_value,
+            'threshold': self.threshold,
+            'condition': self.condition,
+            'status': self.status,
+            'created_at': self.created_at,
+            'message': self.message,
+            'notification_sent': self.notification_sent
+        }
+        if self.acknowledged_at is not None:
+            data['acknowledged_at'] = self.acknowledged_at
+        if self.resolved_at is not None:
+            data['resolved_at'] = self.resolved_at
+        return data
+
 class AlertManager:
     """Real-time alerting and notification system"""
     
     def __init__(self):
         self.alert_rules = []
-        self.active_alerts = []
+        # Open (active or acknowledged) alerts keyed by alert id
+        self.active_alerts = {}
         self.notification_channels = {
             'email': {'enabled': True, 'config': {}},
             'slack': {'enabled': False, 'config': {}},
             'webhook': {'enabled': False, 'config': {}}
         }
-        self.alert_history = []
+        # Bumped on every channel change to invalidate per-rule channel caches
+        self._channel_bump = 0
+        self.alert_history = collections.deque(maxlen=10_000)
+        # Monotonic id sources; ids stay unique when history is evicted
+        self._rule_id_gen = itertools.count(1)
+        self._alert_id_gen = itertools.count(1)
+        # Last fire time per rule id, used for O(1) cooldown checks
+        self._last_fire = {}
+        self._rules_by_id = {}
+        # Compiled (rule, metric, condition_fn, threshold) rows for enabled rules
+        self._rule_table = ()
+        # Queue drained by the background notifier, see start_notifier()
+        self._notify_queue: Optional[asyncio.Queue] = None
+        self._notify_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._notifier = None
+        # Keep-alive HTTP client shared by Slack and webhook deliveries
+        self._http: Optional[httpx.AsyncClient] = None
+        # Authenticated SMTP session reused across email deliveries; the lock
+        # serializes sends because one SMTP connection carries one transaction
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._smtp_lock = asyncio.Lock()
         
+    def start_notifier(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the background notification consumer on the given event loop"""
+        if self._notify_queue is not None:
+            return
+        
+        self._notify_loop = loop
+        self._notify_queue = asyncio.Queue()
+        self._notifier = asyncio.run_coroutine_threadsafe(self._notifier_loop(), loop)
+        logger.info("Alert notifier started")
+    
+    async def close(self) -> None:
+        """Release pooled notification connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._smtp is not None:
+            try:
+                await self._smtp.quit()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+            self._smtp = None
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared notification HTTP client, creating it on first use"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0)
+            )
+        return self._http
+    
     def create_alert_rule(self, rule_config: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new alert rule"""
         rule = {
-            'id': f"alert_{len(self.alert_rules) + 1}",
+            'id': f"alert_{next(self._rule_id_gen)}",
             'name': rule_config.get('name'),
             'metric': rule_config.get('metric'),
             'condition': rule_config.get('condition'),
@@ -36,228 +169,302 @@ class AlertManager:
             'created_at': datetime.now().isoformat(),
             'cooldown_minutes': rule_config.get('cooldown_minutes', 5)
         }
+        # Display name used in alert messages, computed once per rule
+        rule['_metric_display'] = rule['metric'].replace('_', ' ').title()
+        self._refresh_active_channels(rule)
         
         self.alert_rules.append(rule)
+        self._rules_by_id[rule['id']] = rule
+        self._compile_rule_table()
         logger.info(f"Created alert rule: {rule['name']}")
         return rule
     
-    def evaluate_metrics(self, metrics_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def configure_channel(self, channel: str, enabled: Optional[bool] = None,
+                          config: Optional[Dict[str, Any]] = None) -> None:
+        """Enable, disable or reconfigure a notification channel"""
+        settings = self.notification_channels.setdefault(channel, {'enabled': False, 'config': {}})
+        if enabled is not None:
+            settings['enabled'] = enabled
+        if config is not None:
+            settings['config'] = config
+        self._channel_bump += 1
+    
+    def _refresh_active_channels(self, rule: Dict[str, Any]) -> tuple:
+        """Cache the rule's channels that are currently enabled"""
+        rule['_active_channels'] = tuple(
+            channel for channel in rule['notification_channels']
+            if self.notification_channels.get(channel, {}).get('enabled', False)
+        )
+        rule['_channel_bump'] = self._channel_bump
+        return rule['_active_channels']
+    
+    def _active_channels(self, rule: Dict[str, Any]) -> tuple:
+        """Enabled channels for a rule, refreshed only after channel changes"""
+        if rule['_channel_bump'] != self._channel_bump:
+            return self._refresh_active_channels(rule)
+        return rule['_active_channels']
+    
+    def _compile_rule_table(self) -> None:
+        """Rebuild the evaluation table after the rule set changes"""
+        self._rule_table = tuple(
+            (rule, rule['metric'], _CONDITION_FNS.get(rule['condition'], _never), rule['threshold'])
+            for rule in self.alert_rules
+            if rule['enabled']
+        )
+    
+    def evaluate_metrics(self, metrics_data: Dict[str, Any]) -> List[Alert]:
         """Evaluate metrics against alert rules"""
         triggered_alerts = []
+        # One clock read shared by every rule evaluated in this tick
+        now = datetime.now()
+        now_iso = now.isoformat()
         
-        for rule in self.alert_rules:
-            if not rule['enabled']:
-                continue
-                
-            metric_value = metrics_data.get(rule['metric'], 0)
-            threshold = rule['threshold']
-            condition = rule['condition']
+        for rule, metric, condition_fn, threshold in self._rule_table:
+            metric_value = metrics_data.get(metric, 0)
             
             # Check if alert should trigger
-            triggered = self._evaluate_condition(metric_value, condition, threshold)
+            if not condition_fn(metric_value, threshold):
+                continue
             
-            if triggered:
-                # Check cooldown period
-                if not self._is_in_cooldown(rule):
-                    alert = self._create_alert(rule, metric_value)
-                    triggered_alerts.append(alert)
-                    self.active_alerts.append(alert)
-                    
-                    # Send notifications
-                    asyncio.create_task(self._send_notifications(alert))
+            # Check cooldown period
+            if not self._is_in_cooldown(rule, now):
+                alert = self._create_alert(rule, metric_value, now, now_iso)
+                triggered_alerts.append(alert)
+                self.active_alerts[alert.id] = alert
+                
+                # Queue notifications for the background notifier
+                self._enqueue_notification(alert)
         
         return triggered_alerts
     
+    def _enqueue_notification(self, alert: Alert) -> None:
+        """Hand an alert to the background notifier"""
+        if self._notify_queue is None:
+            logger.warning(f"Notifier not started, skipping notifications for alert {alert.id}")
+            return
+        
+        self._notify_loop.call_soon_threadsafe(self._notify_queue.put_nowait, alert)
+    
     def _evaluate_condition(self, value: float, condition: str, threshold: float) -> bool:
         """Evaluate alert condition"""
-        if condition == 'greater_than':
-            return value > threshold
-        elif condition == 'less_than':
-            return value < threshold
-        elif condition == 'equals':
-            return value == threshold
-        elif condition == 'not_equals':
-            return value != threshold
-        elif condition == 'percentage_increase':
-            return (value / threshold - 1) * 100 > 20  # 20% increase
-        return False
+        return _CONDITION_FNS.get(condition, _never)(value, threshold)
     
-    def _is_in_cooldown(self, rule: Dict[str, Any]) -> bool:
+    def _is_in_cooldown(self, rule: Dict[str, Any], now: Optional[datetime] = None) -> bool:
         """Check if alert is in cooldown period"""
-        rule_id = rule['id']
-        cooldown_minutes = rule['cooldown_minutes']
-        
-        # Check recent alerts for this rule
-        recent_alerts = [
-            alert for alert in self.alert_history
-            if alert.get('rule_id') == rule_id and
-            datetime.fromisoformat(alert['created_at']) > datetime.now() - timedelta(minutes=cooldown_minutes)
-        ]
+        last_fired = self._last_fire.get(rule['id'])
+        if last_fired is None:
+            return False
         
-        return len(recent_alerts) > 0
+        return (now or datetime.now()) - last_fired < timedelta(minutes=rule['cooldown_minutes'])
     
-    def _create_alert(self, rule: Dict[str, Any], metric_value: float) -> Dict[str, Any]:
+    def _create_alert(self, rule: Dict[str, Any], metric_value: float,
+                      now: Optional[datetime] = None, now_iso: Optional[str] = None) -> Alert:
         """Create alert object"""
-        alert = {
-            'id': f"alert_{len(self.alert_history) + 1}",
-            'rule_id': rule['id'],
-            'rule_name': rule['name'],
-            'severity': rule['severity'],
-            'metric': rule['metric'],
-            'current_value': metric_value,
-            'threshold': rule['threshold'],
-            'condition': rule['condition'],
-            'status': 'active',
-            'created_at': datetime.now().isoformat(),
-            'message': self._generate_alert_message(rule, metric_value),
-            'notification_sent': False
-        }
+        if now is None:
+            now = datetime.now()
+        if now_iso is None:
+            now_iso = now.isoformat()
+        alert = Alert(
+            id=f"alert_{next(self._alert_id_gen)}",
+            rule_id=rule['id'],
+            rule_name=rule['name'],
+            severity=rule['severity'],
+            metric=rule['metric'],
+            current_value=metric_value,
+            threshold=rule['threshold'],
+            condition=rule['condition'],
+            status='active',
+            created_at=now_iso,
+            message=self._generate_alert_message(rule, metric_value)
+        )
         
+        self._last_fire[rule['id']] = now
         self.alert_history.append(alert)
         return alert
     
     def _generate_alert_message(self, rule: Dict[str, Any], metric_value: float) -> str:
         """Generate human-readable alert message"""
-        condition_map = {
-            'greater_than': 'exceeded',
-            'less_than': 'fell below',
-            'equals': 'equals',
-            'not_equals': 'does not equal'
-        }
+        condition_text = _CONDITION_MAP.get(rule['condition'], 'triggered')
         
-        condition_text = condition_map.get(rule['condition'], 'triggered')
-        metric_name = rule['metric'].replace('_', ' ').title()
+        return f"🚨 ALERT: {rule['_metric_display']} has {condition_text} threshold of {rule['threshold']} (current: {metric_value})"
+    
+    async def _notifier_loop(self) -> None:
+        """Drain queued alerts and deliver their notifications in batches"""
+        queue = self._notify_queue
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                await self._send_notifications_batch(batch)
+            except Exception as e:
+                logger.error(f"Notification batch of {len(batch)} alerts failed: {str(e)}")
+    
+    async def _send_notifications_batch(self, alerts: List[Alert]) -> None:
+        """Send notifications for a batch of alerts across all enabled channels"""
+        deliveries = [
+            (channel, alert)
+            for alert in alerts
+            for channel in self._active_channels(self._rules_by_id[alert.rule_id])
+        ]
+        
+        # Channel sends are independent, so run them concurrently
+        results = await asyncio.gather(
+            *(self._send_channel_notification(channel, alert) for channel, alert in deliveries),
+            return_exceptions=True
+        )
         
-        return f"🚨 ALERT: {metric_name} has {condition_text} threshold of {rule['threshold'] (current: {metric_value})"
+        for (channel, alert), result in zip(deliveries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send {channel} notification: {str(result)}")
+                continue
+            
+            # Mark notification as sent
+            alert.notification_sent = True
+            logger.info(f"Notification sent via {channel} for alert {alert.id}")
+    
+    async def _send_channel_notification(self, channel: str, alert: Alert) -> None:
+        """Send one alert through a single channel"""
+        if channel == 'email':
+            await self._send_email_notification(alert)
+        elif channel == 'slack':
+            await self._send_slack_notification(alert)
+        elif channel == 'webhook':
+            await self._send_webhook_notification(alert)
     
-    async def _send_notifications(self, alert: Dict[str, Any]) -> None:
-        """Send notifications through configured channels"""
-        channels = alert.get('notification_channels', ['email'])
+    async def _ensure_smtp(self, config: Dict[str, Any]) -> aiosmtplib.SMTP:
+        """Return the pooled SMTP session, connecting and logging in once"""
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp
         
-        for channel in channels:
-            if self.notification_channels.get(channel, {}).get('enabled', False):
-                try:
-                    if channel == 'email':
-                        await self._send_email_notification(alert)
-                    elif channel == 'slack':
-                        await self._send_slack_notification(alert)
-                    elif channel == 'webhook':
-                        await self._send_webhook_notification(alert)
-                    
-                    # Mark notification as sent
-                    alert['notification_sent'] = True
-                    logger.info(f"Notification sent via {channel} for alert {alert['id']}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send {channel} notification: {str(e)}")
+        smtp = aiosmtplib.SMTP(
+            hostname=config['host'],
+            port=config.get('port', 587),
+            start_tls=config.get('start_tls', True),
+            timeout=config.get('timeout', 10)
+        )
+        await smtp.connect()
+        if config.get('username'):
+            await smtp.login(config['username'], config.get('password', ''))
+        
+        self._smtp = smtp
+        return smtp
     
-    async def _send_email_notification(self, alert: Dict[str, Any]) -> None:
+    def _build_email(self, alert: Alert, config: Dict[str, Any]) -> EmailMessage:
+        """Build the email message for an alert"""
+        msg = EmailMessage()
+        msg['From'] = config.get('from', 'sre-alerts@company.com')
+        msg['To'] = config.get('to', 'sre-team@company.com')
+        msg['Subject'] = f"SRE Alert: {alert.rule_name}"
+        
+        body = f"""
+        Alert Details:
+        - Rule: {alert.rule_name}
+        - Metric: {alert.metric}
+        - Current Value: {alert.current_value}
+        - Threshold: {alert.threshold}
+        - Severity: {alert.severity}
+        - Time: {alert.created_at}
+        
+        Message: {alert.message}
+        """
+        
+        msg.set_content(body)
+        return msg
+    
+    async def _send_email_notification(self, alert: Alert) -> None:
         """Send email notification"""
-        try:
-            # Simulate email sending (in production, use actual SMTP)
-            msg = MIMEMultipart()
-            msg['From'] = 'sre-alerts@company.com'
-            msg['To'] = 'sre-team@company.com'
-            msg['Subject'] = f"SRE Alert: {alert['rule_name']}"
-            
-            body = f"""
-            Alert Details:
-            - Rule: {alert['rule_name']}
-            - Metric: {alert['metric']}
-            - Current Value: {alert['current_value']}
-            - Threshold: {alert['threshold']}
-            - Severity: {alert['severity']}
-            - Time: {alert['created_at']}
-            
-            Message: {alert['message']}
-            """
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # In production, actually send the email
-            # server = smtplib.SMTP('smtp.company.com', 587)
-            # server.starttls()
-            # server.login('user', 'password')
-            # server.send_message(msg)
-            # server.quit()
-            
-            logger.info(f"Email notification sent for alert {alert['id']}")
-            
-        except Exception as e:
-            logger.error(f"Email notification failed: {str(e)}")
+        config = self.notification_channels['email']['config']
+        
+        # Without an SMTP server there is nothing to send, so skip building the message
+        if config.get('host'):
+            msg = self._build_email(alert, config)
+            async with self._smtp_lock:
+                smtp = await self._ensure_smtp(config)
+                try:
+                    await smtp.send_message(msg)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # Pooled connection went stale; reconnect once and retry
+                    self._smtp = None
+                    smtp = await self._ensure_smtp(config)
+                    await smtp.send_message(msg)
+        
+        logger.info(f"Email notification sent for alert {alert.id}")
     
-    async def _send_slack_notification(self, alert: Dict[str, Any]) -> None:
+    async def _send_slack_notification(self, alert: Alert) -> None:
         """Send Slack notification"""
         # Simulate Slack webhook call
         slack_payload = {
-            "text": alert['message'],
+            "text": alert.message,
             "attachments": [{
-                "color": self._get_severity_color(alert['severity']),
+                "color": self._get_severity_color(alert.severity),
                 "fields": [
-                    {"title": "Metric", "value": alert['metric'], "short": True},
-                    {"title": "Current", "value": str(alert['current_value']), "short": True},
-                    {"title": "Threshold", "value": str(alert['threshold']), "short": True},
-                    {"title": "Severity", "value": alert['severity'], "short": True}
+                    {"title": "Metric", "value": alert.metric, "short": True},
+                    {"title": "Current", "value": str(alert.current_value), "short": True},
+                    {"title": "Threshold", "value": str(alert.threshold), "short": True},
+                    {"title": "Severity", "value": alert.severity, "short": True}
                 ]
             }]
         }
         
-        # In production, make actual webhook call
-        # requests.post(webhook_url, json=slack_payload)
-        logger.info(f"Slack notification sent for alert {alert['id']}")
+        webhook_url = self.notification_channels['slack']['config'].get('webhook_url')
+        if webhook_url:
+            response = await self._get_http_client().post(webhook_url, content=orjson.dumps(slack_payload),
+                                                     headers=_JSON_HEADERS)
+            response.raise_for_status()
+        logger.info(f"Slack notification sent for alert {alert.id}")
     
-    async def _send_webhook_notification(self, alert: Dict[str, Any]) -> None:
+    async def _send_webhook_notification(self, alert: Alert) -> None:
         """Send webhook notification"""
         webhook_payload = {
-            "alert_id": alert['id'],
-            "rule_name": alert['rule_name'],
-            "severity": alert['severity'],
-            "metric": alert['metric'],
-            "current_value": alert['current_value'],
-            "threshold": alert['threshold'],
-            "message": alert['message'],
-            "timestamp": alert['created_at']
+            "alert_id": alert.id,
+            "rule_name": alert.rule_name,
+            "severity": alert.severity,
+            "metric": alert.metric,
+            "current_value": alert.current_value,
+            "threshold": alert.threshold,
+            "message": alert.message,
+            "timestamp": alert.created_at
         }
         
-        # In production, make actual webhook call
-        # requests.post(webhook_url, json=webhook_payload)
-        logger.info(f"Webhook notification sent for alert {alert['id']}")
+        webhook_url = self.notification_channels['webhook']['config'].get('url')
+        if webhook_url:
+            response = await self._get_http_client().post(webhook_url, content=orjson.dumps(webhook_payload),
+                                                     headers=_JSON_HEADERS)
+            response.raise_for_status()
+        logger.info(f"Webhook notification sent for alert {alert.id}")
     
     def _get_severity_color(self, severity: str) -> str:
         """Get color for Slack notification based on severity"""
-        colors = {
-            'critical': 'danger',
-            'high': 'warning',
-            'medium': 'warning',
-            'low': 'good'
-        }
-        return colors.get(severity, 'warning')
+        return _SEVERITY_COLOR.get(severity, 'warning')
     
-    def get_active_alerts(self) -> List[Dict[str, Any]]:
+    def get_active_alerts(self) -> List[Alert]:
         """Get all active alerts"""
-        return [alert for alert in self.active_alerts if alert['status'] == 'active']
+        return [alert for alert in self.active_alerts.values() if alert.status == 'active']
     
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert"""
-        for alert in self.active_alerts:
-            if alert['id'] == alert_id:
-                alert['status'] = 'acknowledged'
-                alert['acknowledged_at'] = datetime.now().isoformat()
-                logger.info(f"Alert {alert_id} acknowledged")
-                return True
-        return False
+        alert = self.active_alerts.get(alert_id)
+        if alert is None:
+            return False
+        
+        alert.status = 'acknowledged'
+        alert.acknowledged_at = datetime.now().isoformat()
+        logger.info(f"Alert {alert_id} acknowledged")
+        return True
     
     def resolve_alert(self, alert_id: str) -> bool:
         """Resolve an alert"""
-        for alert in self.active_alerts:
-            if alert['id'] == alert_id:
-                alert['status'] = 'resolved'
-                alert['resolved_at'] = datetime.now().isoformat()
-                # Remove from active alerts
-                self.active_alerts.remove(alert)
-                logger.info(f"Alert {alert_id} resolved")
-                return True
-        return False
+        # Remove from active alerts
+        alert = self.active_alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        
+        alert.status = 'resolved'
+        alert.resolved_at = datetime.now().isoformat()
+        logger.info(f"Alert {alert_id} resolved")
+        return True
 
 # Global alert manager instance
 alert_manager = AlertManager()
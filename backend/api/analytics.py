@@ -1,58 +1,212 @@
+import bisect
+import collections
+import functools
+import itertools
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
-import statistics
+import re
+import threading
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Root cause keywords searched in incident titles, one named group per cause
+_CAUSE_RE = re.compile(
+    r'(?P<database>database|db)|(?P<network>network|connection)|(?P<infrastructure>memory|cpu)',
+    re.IGNORECASE
+)
+_CAUSE_PRIORITY = ('database', 'network', 'infrastructure')
+
+# Response time bucket edges (ms) for excellent, good and slow performers
+_RESPONSE_TIME_BINS = (-np.inf, 100, 500, np.inf)
+
+# Recommendation rules as (predicate, message), checked in order on every report
+_PERFORMANCE_RULES = (
+    (lambda errors, response_time, availability: errors > 5,
+     "Investigate root cause of high error rate"),
+    (lambda errors, response_time, availability: response_time > 500,
+     "Optimize application performance and database queries"),
+    (lambda errors, response_time, availability: availability < 99.5,
+     "Implement high availability and failover mechanisms"),
+    (lambda errors, response_time, availability: response_time > 200,
+     "Consider implementing caching strategies"),
+)
+_INCIDENT_RULES = (
+    (lambda counts, total: counts.get('critical', 0) > 0,
+     "Review critical incident response procedures"),
+    (lambda counts, total: total > 10,
+     "Implement proactive monitoring to prevent incidents"),
+    (lambda counts, total: counts.get('high', 0) > counts.get('medium', 0),
+     "Focus on reducing high-severity incidents"),
+)
+# SLA messages are format templates filled with the availability gap
+_SLA_RULES = (
+    (lambda availability, target, breaches: availability < target,
+     "Improve availability by {gap:.2f}% to meet SLA"),
+    (lambda availability, target, breaches: breaches > 2,
+     "Review and improve incident response procedures"),
+    (lambda availability, target, breaches: availability < 99.5,
+     "Implement redundant systems and load balancing"),
+)
+_INFRASTRUCTURE_RULES = (
+    (lambda requests, response_time: requests > 800,
+     "Consider horizontal scaling with load balancer"),
+    (lambda requests, response_time: response_time > 300,
+     "Upgrade CPU or optimize application code"),
+    (lambda requests, response_time: requests > 500 and response_time > 200,
+     "Implement auto-scaling based on metrics"),
+)
+
+def _cached_report(method):
+    """Reuse a generated report until new metrics or incidents are added"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            if self._report_cache_version != self._version:
+                self._report_cache.clear()
+                self._report_cache_version = self._version
+            
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            report = self._report_cache.get(key)
+            if report is None:
+                report = self._report_cache[key] = method(self, *args, **kwargs)
+            return report
+    return wrapper
+
+class MetricsBuffer:
+    """Bounded column store for metric samples, oldest first"""
+    
+    # Column name and default used when a sample omits the field
+    COLUMNS = {
+        'request_count': 0,
+        'error_count': 0,
+        'response_time_avg': 0,
+        'availability_percentage': 100
+    }
+    
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        # Columns have room for two windows so appends only compact once per
+        # `capacity` samples, and the live window is always one contiguous slice
+        self._allocated = capacity * 2
+        # error_rate is derived at append time so reports read it like any column
+        self._names = ('timestamp',) + tuple(self.COLUMNS) + ('error_rate',)
+        self._block, self._columns = self._allocate()
+        self._start = 0
+        self._end = 0
+    
+    def _allocate(self):
+        """Allocate one C-ordered block with a contiguous row per column, including epoch timestamps"""
+        # Each row is a plain float64 buffer, so NumPy, pandas or Arrow can wrap
+        # a window without copying it
+        block = np.empty((len(self._names), self._allocated), dtype=np.float64)
+        return block, dict(zip(self._names, block))
+    
+    def __len__(self) -> int:
+        return self._end - self._start
+    
+    def append(self, timestamp: float, metrics: Dict[str, Any]) -> None:
+        """Append one sample, evicting the oldest once at capacity"""
+        if self._end == self._allocated:
+            # Copy the live window into fresh arrays so views returned earlier
+            # keep seeing the data they were created over
+            block, columns = self._allocate()
+            size = self._end - self._start
+            block[:, :size] = self._block[:, self._start:self._end]
+            self._block, self._columns = block, columns
+            self._start, self._end = 0, size
+        
+        end, columns = self._end, self._columns
+        columns['timestamp'][end] = timestamp
+        for name, default in self.COLUMNS.items():
+            columns[name][end] = metrics.get(name, default)
+        # Percent of requests that errored; idle periods count as one request
+        columns['error_rate'][end] = columns['error_count'][end] / max(columns['request_count'][end], 1) * 100
+        
+        self._end = end + 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+    
+    def window(self, since: Optional[float] = None, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Return zero-copy column views from a cutoff timestamp or for the last N samples"""
+        columns, start, end = self._columns, self._start, self._end
+        if since is not None:
+            start += int(np.searchsorted(columns['timestamp'][start:end], since, side='left'))
+        if last is not None:
+            start = max(start, end - last)
+        return {name: column[start:end] for name, column in columns.items()}
+
 class AnalyticsEngine:
     """Advanced analytics and reporting engine"""
     
     def __init__(self):
-        self.raw_metrics = []
-        self.incident_data = []
+        # Metric samples are kept as columns; incidents in a bounded deque
+        self.metrics_buffer = MetricsBuffer(capacity=1000)
+        self.incident_data = collections.deque(maxlen=500)
+        # Creation epoch of each buffered incident, kept parallel to incident_data
+        self._incident_ts = collections.deque(maxlen=500)
+        # Bumped on every write; reports are cached per version and shared
+        # between callers, so they must be treated as read-only
+        self._version = 0
+        self._report_cache = {}
+        self._report_cache_version = 0
+        # Reports may run in worker threads; writes and report generation take
+        # this lock so a report never iterates a buffer mid-append
+        self._lock = threading.RLock()
         self.alert_data = []
         
     def add_metrics_data(self, metrics: Dict[str, Any]) -> None:
         """Add metrics data for analytics"""
-        self.raw_metrics.append(metrics)
-        if len(self.raw_metrics) > 1000:
-            self.raw_metrics.pop(0)
+        timestamp = metrics.get('timestamp')
+        epoch = datetime.fromisoformat(timestamp).timestamp() if timestamp else datetime.now().timestamp()
+        with self._lock:
+            self.metrics_buffer.append(epoch, metrics)
+            self._version += 1
     
     def add_incident_data(self, incident: Dict[str, Any]) -> None:
         """Add incident data for analytics"""
-        self.incident_data.append(incident)
-        if len(self.incident_data) > 500:
-            self.incident_data.pop(0)
+        created = datetime.fromisoformat(incident['created_at']).timestamp()
+        with self._lock:
+            self.incident_data.append(incident)
+            self._incident_ts.append(created)
+            self._version += 1
     
+    @_cached_report
     def generate_performance_report(self, time_range: str = "24h") -> Dict[str, Any]:
         """Generate comprehensive performance report"""
-        if not self.raw_metrics:
+        if not len(self.metrics_buffer):
             return {"error": "No metrics data available"}
         
-        # Filter metrics by time range
-        filtered_metrics = self._filter_by_time_range(self.raw_metrics, time_range)
+        # Select metrics in time range
+        window = self.metrics_buffer.window(since=self._get_cutoff_timestamp(time_range))
         
-        if not filtered_metrics:
+        if not len(window['timestamp']):
             return {"error": "No data in specified time range"}
         
         # Calculate performance metrics
-        request_counts = [m.get('request_count', 0) for m in filtered_metrics]
-        error_counts = [m.get('error_count', 0) for m in filtered_metrics]
-        response_times = [m.get('response_time_avg', 0) for m in filtered_metrics]
-        availability_scores = [m.get('availability_percentage', 100) for m in filtered_metrics]
+        request_counts = window['request_count']
+        error_counts = window['error_count']
+        response_times = window['response_time_avg']
+        availability_scores = window['availability_percentage']
+        
+        # Each reduction runs once and is shared by the summary and recommendations
+        avg_errors = float(error_counts.mean())
+        avg_response_time = float(response_times.mean())
+        avg_availability = float(availability_scores.mean())
+        excellent, good, slow = np.histogram(response_times, bins=_RESPONSE_TIME_BINS)[0].tolist()
         
         report = {
             "report_period": time_range,
             "generated_at": datetime.now().isoformat(),
             "summary": {
-                "total_requests": sum(request_counts),
-                "total_errors": sum(error_counts),
-                "overall_availability": statistics.mean(availability_scores) if availability_scores else 100,
-                "avg_response_time": statistics.mean(response_times) if response_times else 0,
-                "max_response_time": max(response_times) if response_times else 0,
-                "min_response_time": min(response_times) if response_times else 0
+                "total_requests": int(request_counts.sum()),
+                "total_errors": int(error_counts.sum()),
+                "overall_availability": avg_availability,
+                "avg_response_time": avg_response_time,
+                "max_response_time": float(response_times.max()),
+                "min_response_time": float(response_times.min())
             },
             "trends": {
                 "error_rate_trend": self._calculate_trend(error_counts),
@@ -60,42 +214,38 @@ class AnalyticsEngine:
                 "availability_trend": self._calculate_trend(availability_scores)
             },
             "performance_distribution": {
-                "excellent_performers": len([r for r in response_times if r < 100]),
-                "good_performers": len([r for r in response_times if 100 <= r < 500]),
-                "slow_performers": len([r for r in response_times if r >= 500])
+                "excellent_performers": excellent,
+                "good_performers": good,
+                "slow_performers": slow
             },
             "recommendations": self._generate_performance_recommendations(
-                statistics.mean(error_counts), 
-                statistics.mean(response_times) if response_times else 0,
-                statistics.mean(availability_scores) if availability_scores else 100
+                avg_errors,
+                avg_response_time,
+                avg_availability
             )
         }
         
         return report
     
+    @_cached_report
     def generate_incident_report(self, time_range: str = "7d") -> Dict[str, Any]:
         """Generate incident analysis report"""
         if not self.incident_data:
             return {"error": "No incident data available"}
         
-        filtered_incidents = self._filter_incidents_by_time_range(self.incident_data, time_range)
+        filtered_incidents = self._filter_incidents_by_time_range(time_range)
         
         # Analyze incident patterns
-        severity_counts = {}
-        for incident in filtered_incidents:
-            severity = incident.get('severity', 'unknown')
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        severity_counts = collections.Counter(incident.get('severity', 'unknown') for incident in filtered_incidents)
         
         # Calculate MTTR
         resolved_incidents = [i for i in filtered_incidents if i.get('status') == 'resolved']
-        mttr_values = []
+        timed_incidents = [i for i in resolved_incidents if i.get('created_at') and i.get('resolved_at')]
         
-        for incident in resolved_incidents:
-            if incident.get('created_at') and incident.get('resolved_at'):
-                created = datetime.fromisoformat(incident['created_at'])
-                resolved = datetime.fromisoformat(incident['resolved_at'])
-                mttr_minutes = (resolved - created).total_seconds() / 60
-                mttr_values.append(mttr_minutes)
+        # Parse all timestamps in one batch and diff at microsecond precision
+        created = np.array([i['created_at'] for i in timed_incidents], dtype='datetime64[us]')
+        resolved = np.array([i['resolved_at'] for i in timed_incidents], dtype='datetime64[us]')
+        mttr = (resolved - created) / np.timedelta64(1, 'm')
         
         report = {
             "report_period": time_range,
@@ -104,13 +254,13 @@ class AnalyticsEngine:
                 "total_incidents": len(filtered_incidents),
                 "resolved_incidents": len(resolved_incidents),
                 "active_incidents": len([i for i in filtered_incidents if i.get('status') == 'open']),
-                "mttr_minutes": statistics.mean(mttr_values) if mttr_values else 0,
-                "mttr_95th_percentile": statistics.quantiles(mttr_values, 0.95) if len(mttr_values) > 1 else 0
+                "mttr_minutes": float(mttr.mean()) if mttr.size else 0,
+                "mttr_95th_percentile": float(np.quantile(mttr, 0.95)) if mttr.size > 1 else 0
             },
             "severity_breakdown": severity_counts,
             "incident_trends": {
                 "daily_incident_count": self._calculate_daily_incident_trend(filtered_incidents),
-                "most_common_severity": max(severity_counts, key=severity_counts.get) if severity_counts else 'medium',
+                "most_common_severity": severity_counts.most_common(1)[0][0] if severity_counts else 'medium',
                 "incident_rate_per_day": len(filtered_incidents) / max(1, self._get_days_in_period(time_range))
             },
             "root_cause_analysis": self._analyze_root_causes(filtered_incidents),
@@ -119,43 +269,45 @@ class AnalyticsEngine:
         
         return report
     
+    @_cached_report
     def generate_sla_report(self, time_range: str = "30d") -> Dict[str, Any]:
         """Generate SLA compliance report"""
-        if not self.raw_metrics:
+        if not len(self.metrics_buffer):
             return {"error": "No metrics data available"}
         
-        filtered_metrics = self._filter_by_time_range(self.raw_metrics, time_range)
+        window = self.metrics_buffer.window(since=self._get_cutoff_timestamp(time_range))
         
         # Calculate SLA metrics
-        availability_scores = [m.get('availability_percentage', 100) for m in filtered_metrics]
-        error_rates = [(m.get('error_count', 0) / max(m.get('request_count', 1), 1)) * 100 
-                       for m in filtered_metrics]
+        availability_scores = window['availability_percentage']
+        error_rates = window['error_rate']
         
         sla_target = 99.9
-        compliance_periods = len([a for a in availability_scores if a >= sla_target])
+        breach_mask = availability_scores < sla_target
         total_periods = len(availability_scores)
+        compliance_periods = total_periods - int(breach_mask.sum())
+        actual_availability = float(availability_scores.mean()) if total_periods else 100
         
         report = {
             "report_period": time_range,
             "generated_at": datetime.now().isoformat(),
             "sla_summary": {
                 "target_availability": sla_target,
-                "actual_availability": statistics.mean(availability_scores) if availability_scores else 100,
+                "actual_availability": actual_availability,
                 "sla_compliance_percentage": (compliance_periods / total_periods * 100) if total_periods > 0 else 0,
-                "total_downtime_minutes": sum([(100 - a) * 0.1 for a in availability_scores]),  # Convert to minutes
-                "average_error_rate": statistics.mean(error_rates) if error_rates else 0
+                "total_downtime_minutes": float(((100 - availability_scores) * 0.1).sum()),  # Convert to minutes
+                "average_error_rate": float(error_rates.mean()) if total_periods else 0
             },
             "sla_breaches": {
                 "total_breaches": total_periods - compliance_periods,
-                "worst_availability": min(availability_scores) if availability_scores else 100,
-                "breach_details": self._identify_sla_breaches(availability_scores, sla_target)
+                "worst_availability": float(availability_scores.min()) if total_periods else 100,
+                "breach_details": self._identify_sla_breaches(availability_scores, sla_target, breach_mask)
             },
             "trend_analysis": {
                 "availability_trend": self._calculate_trend(availability_scores),
                 "error_rate_trend": self._calculate_trend(error_rates)
             },
             "recommendations": self._generate_sla_recommendations(
-                statistics.mean(availability_scores) if availability_scores else 100,
+                actual_availability,
                 sla_target,
                 total_periods - compliance_periods
             )
@@ -163,34 +315,39 @@ class AnalyticsEngine:
         
         return report
     
+    @_cached_report
     def generate_capacity_planning_report(self) -> Dict[str, Any]:
         """Generate capacity planning recommendations"""
-        if not self.raw_metrics:
+        if not len(self.metrics_buffer):
             return {"error": "No metrics data available"}
         
         # Analyze current capacity usage
-        recent_metrics = self.raw_metrics[-24:] if len(self.raw_metrics) >= 24 else self.raw_metrics
+        recent_metrics = self.metrics_buffer.window(last=24)
+        
+        request_counts = recent_metrics['request_count']
+        response_times = recent_metrics['response_time_avg']
+        error_rates = recent_metrics['error_rate']
         
-        request_counts = [m.get('request_count', 0) for m in recent_metrics]
-        response_times = [m.get('response_time_avg', 0) for m in recent_metrics]
-        error_rates = [(m.get('error_count', 0) / max(m.get('request_count', 1), 1)) * 100 
-                     for m in recent_metrics]
+        # One (3, n) block gives every mean and peak in two reductions
+        summary = np.stack((request_counts, response_times, error_rates))
+        avg_requests, avg_response_time, avg_error_rate = summary.mean(axis=1).tolist()
+        max_requests, max_response_time, max_error_rate = summary.max(axis=1).tolist()
         
         # Calculate growth trends
         request_growth = self._calculate_growth_trend(request_counts)
         peak_usage = {
-            "max_requests_per_minute": max(request_counts) if request_counts else 0,
-            "peak_response_time": max(response_times) if response_times else 0,
-            "peak_error_rate": max(error_rates) if error_rates else 0
+            "max_requests_per_minute": max_requests,
+            "peak_response_time": max_response_time,
+            "peak_error_rate": max_error_rate
         }
         
         report = {
             "generated_at": datetime.now().isoformat(),
             "current_capacity_analysis": {
-                "avg_requests_per_period": statistics.mean(request_counts) if request_counts else 0,
-                "avg_response_time": statistics.mean(response_times) if response_times else 0,
-                "avg_error_rate": statistics.mean(error_rates) if error_rates else 0,
-                "utilization_percentage": min(95, (statistics.mean(request_counts) / 1000) * 100)  # Assuming 1000 as baseline
+                "avg_requests_per_period": avg_requests,
+                "avg_response_time": avg_response_time,
+                "avg_error_rate": avg_error_rate,
+                "utilization_percentage": min(95, (avg_requests / 1000) * 100)  # Assuming 1000 as baseline
             },
             "growth_analysis": {
                 "request_growth_rate": request_growth,
@@ -198,24 +355,21 @@ class AnalyticsEngine:
             },
             "peak_usage_analysis": peak_usage,
             "capacity_recommendations": {
-                "scaling_needed": request_growth > 0.2 or statistics.mean(response_times) > 500,
-                "recommended_capacity": int(statistics.mean(request_counts) * 1.5) if request_counts else 1000,
-                "performance_optimization": statistics.mean(response_times) > 300,
-                "monitoring_enhancement": statistics.mean(error_rates) > 1.0
+                "scaling_needed": request_growth > 0.2 or avg_response_time > 500,
+                "recommended_capacity": int(avg_requests * 1.5),
+                "performance_optimization": avg_response_time > 300,
+                "monitoring_enhancement": avg_error_rate > 1.0
             },
             "infrastructure_suggestions": self._generate_infrastructure_recommendations(
-                statistics.mean(request_counts) if request_counts else 0,
-                statistics.mean(response_times) if response_times else 0
+                avg_requests,
+                avg_response_time
             )
         }
         
         return report
     
-    def _filter_by_time_range(self, metrics: List[Dict], time_range: str) -> List[Dict]:
-        """Filter metrics by time range"""
-        if not metrics:
-            return []
-        
+    def _get_cutoff_timestamp(self, time_range: str) -> float:
+        """Epoch timestamp for the start of a time range"""
         # Parse time range (e.g., "24h", "7d", "30d")
         if time_range.endswith('h'):
             hours = int(time_range[:-1])
@@ -226,31 +380,29 @@ class AnalyticsEngine:
         else:
             cutoff_time = datetime.now() - timedelta(days=1)  # Default to 1 day
         
-        return [m for m in metrics if datetime.fromisoformat(m['timestamp']) >= cutoff_time]
+        return cutoff_time.timestamp()
     
-    def _filter_incidents_by_time_range(self, incidents: List[Dict], time_range: str) -> List[Dict]:
+    def _filter_incidents_by_time_range(self, time_range: str) -> List[Dict]:
         """Filter incidents by time range"""
-        if not incidents:
-            return []
-        
-        if time_range.endswith('h'):
-            hours = int(time_range[:-1])
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-        elif time_range.endswith('d'):
-            days = int(time_range[:-1])
-            cutoff_time = datetime.now() - timedelta(days=days)
-        else:
-            cutoff_time = datetime.now() - timedelta(days=1)
-        
-        return [i for i in incidents if datetime.fromisoformat(i['created_at']) >= cutoff_time]
+        # Incidents arrive in creation order, so the range is a suffix
+        index = bisect.bisect_left(self._incident_ts, self._get_cutoff_timestamp(time_range))
+        return list(itertools.islice(self.incident_data, index, None))
+    
+    def _calculate_daily_incident_trend(self, incidents: List[Dict]) -> Dict[str, int]:
+        """Count incidents per creation day"""
+        return collections.Counter(incident['created_at'][:10] for incident in incidents)
     
     def _calculate_trend(self, values: List[float]) -> str:
         """Calculate trend direction"""
         if len(values) < 2:
             return "insufficient_data"
         
-        recent_avg = statistics.mean(values[-5:]) if len(values) >= 5 else statistics.mean(values)
-        older_avg = statistics.mean(values[-10:-5]) if len(values) >= 10 else statistics.mean(values[:-5])
+        values = np.asarray(values, dtype=np.float64)
+        recent_avg = values[-5:].mean() if len(values) >= 5 else values.mean()
+        older_window = values[-10:-5] if len(values) >= 10 else values[:-5]
+        if not len(older_window):
+            return "insufficient_data"
+        older_avg = older_window.mean()
         
         if recent_avg > older_avg * 1.1:
             return "increasing"
@@ -264,13 +416,17 @@ class AnalyticsEngine:
         if len(values) < 2:
             return 0.0
         
-        recent_avg = statistics.mean(values[-7:]) if len(values) >= 7 else statistics.mean(values)
-        older_avg = statistics.mean(values[-14:-7]) if len(values) >= 14 else statistics.mean(values[:-7])
+        values = np.asarray(values, dtype=np.float64)
+        recent_avg = values[-7:].mean() if len(values) >= 7 else values.mean()
+        older_window = values[-14:-7] if len(values) >= 14 else values[:-7]
+        if not len(older_window):
+            return 0.0
+        older_avg = older_window.mean()
         
         if older_avg == 0:
             return 0.0
         
-        return ((recent_avg - older_avg) / older_avg) * 100
+        return float(((recent_avg - older_avg) / older_avg) * 100)
     
     def _get_days_in_period(self, time_range: str) -> int:
         """Get number of days in time range"""
@@ -282,95 +438,57 @@ class AnalyticsEngine:
         else:
             return 1
     
-    def _identify_sla_breaches(self, availability_scores: List[float], target: float) -> List[Dict]:
+    def _identify_sla_breaches(self, availability_scores: np.ndarray, target: float,
+                               breach_mask: Optional[np.ndarray] = None) -> List[Dict]:
         """Identify specific SLA breaches"""
-        breaches = []
-        for i, availability in enumerate(availability_scores):
-            if availability < target:
-                breaches.append({
-                    "period_index": i,
-                    "availability": availability,
-                    "shortfall_percentage": target - availability
-                })
-        return breaches
+        if breach_mask is None:
+            breach_mask = availability_scores < target
+        
+        breach_indices = np.flatnonzero(breach_mask)
+        return [
+            {
+                "period_index": i,
+                "availability": availability,
+                "shortfall_percentage": target - availability
+            }
+            for i, availability in zip(breach_indices.tolist(), availability_scores[breach_indices].tolist())
+        ]
     
     def _generate_performance_recommendations(self, avg_errors: float, avg_response_time: float, avg_availability: float) -> List[str]:
         """Generate performance recommendations"""
-        recommendations = []
-        
-        if avg_errors > 5:
-            recommendations.append("Investigate root cause of high error rate")
-        
-        if avg_response_time > 500:
-            recommendations.append("Optimize application performance and database queries")
-        
-        if avg_availability < 99.5:
-            recommendations.append("Implement high availability and failover mechanisms")
-        
-        if avg_response_time > 200:
-            recommendations.append("Consider implementing caching strategies")
-        
-        return recommendations
+        return [message for rule, message in _PERFORMANCE_RULES
+                if rule(avg_errors, avg_response_time, avg_availability)]
     
     def _generate_incident_recommendations(self, severity_counts: Dict, total_incidents: int) -> List[str]:
         """Generate incident management recommendations"""
-        recommendations = []
-        
-        if severity_counts.get('critical', 0) > 0:
-            recommendations.append("Review critical incident response procedures")
-        
-        if total_incidents > 10:
-            recommendations.append("Implement proactive monitoring to prevent incidents")
-        
-        if severity_counts.get('high', 0) > severity_counts.get('medium', 0):
-            recommendations.append("Focus on reducing high-severity incidents")
-        
-        return recommendations
+        return [message for rule, message in _INCIDENT_RULES
+                if rule(severity_counts, total_incidents)]
     
     def _generate_sla_recommendations(self, actual_availability: float, target: float, breaches: int) -> List[str]:
         """Generate SLA improvement recommendations"""
-        recommendations = []
-        
-        if actual_availability < target:
-            recommendations.append(f"Improve availability by {target - actual_availability:.2f}% to meet SLA")
-        
-        if breaches > 2:
-            recommendations.append("Review and improve incident response procedures")
-        
-        if actual_availability < 99.5:
-            recommendations.append("Implement redundant systems and load balancing")
-        
-        return recommendations
+        gap = target - actual_availability
+        return [message.format(gap=gap) for rule, message in _SLA_RULES
+                if rule(actual_availability, target, breaches)]
     
     def _analyze_root_causes(self, incidents: List[Dict]) -> Dict[str, Any]:
         """Analyze root causes from incident data"""
         # This is a simplified analysis - in production, would use AI/ML
-        causes = {}
-        for incident in incidents:
-            title = incident.get('title', '').lower()
-            if 'database' in title or 'db' in title:
-                causes['database'] = causes.get('database', 0) + 1
-            elif 'network' in title or 'connection' in title:
-                causes['network'] = causes.get('network', 0) + 1
-            elif 'memory' in title or 'cpu' in title:
-                causes['infrastructure'] = causes.get('infrastructure', 0) + 1
-        
-        return causes
+        causes = (self._primary_cause(incident.get('title', '')) for incident in incidents)
+        return collections.Counter(cause for cause in causes if cause is not None)
+    
+    def _primary_cause(self, title: str) -> Optional[str]:
+        """Root cause category named in a title, if any"""
+        # One scan finds every cause mentioned; the earliest in priority order wins
+        found = {match.lastgroup for match in _CAUSE_RE.finditer(title)}
+        for cause in _CAUSE_PRIORITY:
+            if cause in found:
+                return cause
+        return None
     
     def _generate_infrastructure_recommendations(self, avg_requests: int, avg_response_time: float) -> List[str]:
         """Generate infrastructure scaling recommendations"""
-        recommendations = []
-        
-        if avg_requests > 800:
-            recommendations.append("Consider horizontal scaling with load balancer")
-        
-        if avg_response_time > 300:
-            recommendations.append("Upgrade CPU or optimize application code")
-        
-        if avg_requests > 500 and avg_response_time > 200:
-            recommendations.append("Implement auto-scaling based on metrics")
-        
-        return recommendations
+        return [message for rule, message in _INFRASTRUCTURE_RULES
+                if rule(avg_requests, avg_response_time)]
 
 # Global analytics engine instance
 analytics_engine = AnalyticsEngine()
@@ -1,26 +1,59 @@
-import json
+import bisect
+import collections
+import itertools
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
-import uuid
+import operator
+import os
+import time
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_timestamp_key = operator.itemgetter('timestamp')
+
+# Entry ids are 16 random bytes, drawn from os.urandom 256 ids at a time
+_ID_BYTES = 16
+_ID_BATCH = 256
+
+# Resource type for each known top-level path segment
+_RESOURCE_TYPES = {
+    'incidents': 'incident',
+    'alerts': 'alert',
+    'metrics': 'metrics',
+    'users': 'user',
+    'system': 'system'
+}
+
+# Marks a filter that was not requested
+_ANY = object()
+
 class AuditLogger:
     """Comprehensive logging and audit trail system"""
     
     def __init__(self):
-        self.audit_logs = []
+        # Bounded buffers; deque evicts the oldest entry in O(1)
+        self.audit_logs = collections.deque(maxlen=1000)
         self.session_logs = []
-        self.access_logs = []
-        self.system_events = []
+        self.access_logs = collections.deque(maxlen=1000)
+        self.system_events = collections.deque(maxlen=500)
+        # Secondary indexes over audit_logs, each bucket in append order
+        self._audit_by_user = collections.defaultdict(collections.deque)
+        self._audit_by_category = collections.defaultdict(collections.deque)
+        # Random bytes drawn in bulk and sliced into 128-bit entry ids
+        self._rand_buf = b''
+        self._rand_off = 0
+        # ISO text of the current wall-clock second, reused until it ticks over
+        self._ts_second = None
+        self._ts_prefix = ''
         
     def log_user_action(self, user_id: str, action: str, resource: str, 
                        details: Dict[str, Any] = None, ip_address: str = None) -> None:
         """Log user actions for audit trail"""
         audit_entry = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
+            'id': self._new_id(),
+            'timestamp': self._timestamp(),
             'user_id': user_id,
             'action': action,
             'resource': resource,
@@ -33,19 +66,54 @@ class AuditLogger:
             'category': 'user_action'
         }
         
-        self.audit_logs.append(audit_entry)
-        logger.info(f"User action logged: {user_id} - {action} on {resource}")
+        self._append_audit_log(audit_entry)
+        logger.info("User action logged: %s - %s on %s", user_id, action, resource)
+    
+    def _timestamp(self) -> str:
+        """Current local time in datetime.isoformat() form"""
+        second, nanos = divmod(time.time_ns(), 1_000_000_000)
+        if second != self._ts_second:
+            self._ts_prefix = datetime.fromtimestamp(second).isoformat()
+            self._ts_second = second
+        
+        micros = nanos // 1000
+        return f"{self._ts_prefix}.{micros:06d}" if micros else self._ts_prefix
+    
+    def _new_id(self) -> str:
+        """Return a random 128-bit hex id, refilling the random pool as needed"""
+        if self._rand_off >= len(self._rand_buf):
+            self._rand_buf = os.urandom(_ID_BYTES * _ID_BATCH)
+            self._rand_off = 0
         
-        # Keep only last 1000 audit entries
-        if len(self.audit_logs) > 1000:
-            self.audit_logs.pop(0)
+        offset = self._rand_off
+        self._rand_off = offset + _ID_BYTES
+        return self._rand_buf[offset:offset + _ID_BYTES].hex()
+    
+    def _append_audit_log(self, entry: Dict[str, Any]) -> None:
+        """Append an audit entry and keep the secondary indexes in sync"""
+        if len(self.audit_logs) == self.audit_logs.maxlen:
+            # The evicted entry is the oldest, so it heads both of its buckets
+            evicted = self.audit_logs[0]
+            self._pop_index(self._audit_by_user, evicted.get('user_id'))
+            self._pop_index(self._audit_by_category, evicted.get('category'))
+        
+        self.audit_logs.append(entry)
+        self._audit_by_user[entry.get('user_id')].append(entry)
+        self._audit_by_category[entry.get('category')].append(entry)
+    
+    def _pop_index(self, index: Dict[Any, collections.deque], key: Any) -> None:
+        """Drop the oldest entry from an index bucket"""
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
     
     def log_system_event(self, event_type: str, severity: str, message: str,
                        source: str = None, metadata: Dict[str, Any] = None) -> None:
         """Log system events"""
         system_event = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
+            'id': self._new_id(),
+            'timestamp': self._timestamp(),
             'event_type': event_type,
             'severity': severity,
             'message': message,
@@ -55,18 +123,14 @@ class AuditLogger:
         }
         
         self.system_events.append(system_event)
-        logger.info(f"System event logged: {event_type} - {severity} - {message}")
-        
-        # Keep only last 500 system events
-        if len(self.system_events) > 500:
-            self.system_events.pop(0)
+        logger.info("System event logged: %s - %s - %s", event_type, severity, message)
     
     def log_access_attempt(self, user_id: str, resource: str, success: bool,
                         ip_address: str = None, failure_reason: str = None) -> None:
         """Log access attempts"""
         access_entry = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
+            'id': self._new_id(),
+            'timestamp': self._timestamp(),
             'user_id': user_id,
             'resource': resource,
             'access_type': self._get_resource_type(resource),
@@ -77,18 +141,14 @@ class AuditLogger:
         }
         
         self.access_logs.append(access_entry)
-        logger.info(f"Access attempt logged: {user_id} - {resource} - {success}")
-        
-        # Keep only last 1000 access logs
-        if len(self.access_logs) > 1000:
-            self.access_logs.pop(0)
+        logger.info("Access attempt logged: %s - %s - %s", user_id, resource, success)
     
     def log_incident_lifecycle(self, incident_id: str, action: str, user_id: str = None,
                              details: Dict[str, Any] = None) -> None:
         """Log incident lifecycle events"""
         incident_event = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
+            'id': self._new_id(),
+            'timestamp': self._timestamp(),
             'incident_id': incident_id,
             'action': action,  # created, updated, assigned, resolved, closed
             'user_id': user_id,
@@ -96,15 +156,15 @@ class AuditLogger:
             'category': 'incident_lifecycle'
         }
         
-        self.audit_logs.append(incident_event)
-        logger.info(f"Incident lifecycle logged: {incident_id} - {action}")
+        self._append_audit_log(incident_event)
+        logger.info("Incident lifecycle logged: %s - %s", incident_id, action)
     
     def log_configuration_change(self, config_item: str, old_value: Any, new_value: Any,
                               user_id: str, reason: str = None) -> None:
         """Log configuration changes"""
         config_change = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
+            'id': self._new_id(),
+            'timestamp': self._timestamp(),
             'config_item': config_item,
             'old_value': old_value,
             'new_value': new_value,
@@ -113,16 +173,16 @@ class AuditLogger:
             'category': 'configuration_change'
         }
         
-        self.audit_logs.append(config_change)
-        logger.info(f"Configuration change logged: {config_item} by {user_id}")
+        self._append_audit_log(config_change)
+        logger.info("Configuration change logged: %s by %s", config_item, user_id)
     
     def log_api_access(self, endpoint: str, method: str, user_id: str = None,
                      status_code: int = None, response_time: float = None,
                      request_size: int = None, ip_address: str = None) -> None:
         """Log API access"""
         api_access = {
-            'id': str(uuid.uuid4()),
-            'timestamp': datetime.now().isoformat(),
+            'id': self._new_id(),
+            'timestamp': self._timestamp(),
             'endpoint': endpoint,
             'method': method,
             'user_id': user_id,
@@ -133,88 +193,91 @@ class AuditLogger:
             'category': 'api_access'
         }
         
-        self.audit_logs.append(api_access)
-        logger.info(f"API access logged: {method} {endpoint} - {status_code}")
+        self._append_audit_log(api_access)
+        logger.info("API access logged: %s %s - %s", method, endpoint, status_code)
     
     def get_audit_logs(self, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get audit logs with optional filtering"""
-        logs = self.audit_logs.copy()
+        filters = filters or {}
+        
+        # Start from the narrowest index bucket for equality filters
+        if 'user_id' in filters:
+            logs = self._audit_by_user.get(filters['user_id'], ())
+        elif 'category' in filters:
+            logs = self._audit_by_category.get(filters['category'], ())
+        else:
+            logs = self.audit_logs
+        
+        # Entries are appended in timestamp order, so a date range is a slice
+        # and walking it backwards yields newest first without sorting
+        window = self._slice_by_date(logs, filters.get('start_date'), filters.get('end_date'))
         
-        if filters:
-            # Filter by user_id
-            if 'user_id' in filters:
-                logs = [log for log in logs if log.get('user_id') == filters['user_id']]
-            
-            # Filter by category
-            if 'category' in filters:
-                logs = [log for log in logs if log.get('category') == filters['category']]
-            
-            # Filter by date range
-            if 'start_date' in filters:
-                start_date = datetime.fromisoformat(filters['start_date'])
-                logs = [log for log in logs if datetime.fromisoformat(log['timestamp']) >= start_date]
-            
-            if 'end_date' in filters:
-                end_date = datetime.fromisoformat(filters['end_date'])
-                logs = [log for log in logs if datetime.fromisoformat(log['timestamp']) <= end_date]
-            
-            # Filter by resource
-            if 'resource' in filters:
-                logs = [log for log in logs if filters['resource'] in log.get('resource', '')]
+        # Apply the remaining filters in a single pass
+        category = filters['category'] if 'user_id' in filters and 'category' in filters else _ANY
+        resource = filters['resource'] if 'resource' in filters else _ANY
+        logs = [
+            log for log in window
+            if (category is _ANY or log.get('category') == category)
+            and (resource is _ANY or resource in log.get('resource', ''))
+        ]
         
-        # Sort by timestamp (newest first)
-        logs.sort(key=lambda x: x['timestamp'], reverse=True)
         return logs
     
+    def _slice_by_date(self, logs, start_date: Optional[str], end_date: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Iterate the entries of a timestamp-ordered buffer within a date range, newest first"""
+        lo, hi = self._date_bounds(logs, start_date, end_date)
+        return itertools.islice(reversed(logs), len(logs) - hi, len(logs) - lo)
+    
+    def _date_bounds(self, logs, start_date: Optional[str], end_date: Optional[str]) -> Tuple[int, int]:
+        """Index range of a timestamp-ordered buffer within an inclusive date range"""
+        lo, hi = 0, len(logs)
+        # Normalized ISO strings of naive datetimes sort chronologically
+        if start_date is not None:
+            start_date = datetime.fromisoformat(start_date).isoformat()
+            lo = bisect.bisect_left(logs, start_date, key=_timestamp_key)
+        if end_date is not None:
+            end_date = datetime.fromisoformat(end_date).isoformat()
+            hi = bisect.bisect_right(logs, end_date, lo=lo, key=_timestamp_key)
+        return lo, hi
+    
     def get_access_logs(self, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get access logs with optional filtering"""
-        logs = self.access_logs.copy()
+        filters = filters or {}
+        window = self._slice_by_date(self.access_logs, filters.get('start_date'), None)
         
-        if filters:
-            # Filter by success
-            if 'success' in filters:
-                logs = [log for log in logs if log.get('success') == filters['success']]
-            
-            # Filter by date range
-            if 'start_date' in filters:
-                start_date = datetime.fromisoformat(filters['start_date'])
-                logs = [log for log in logs if datetime.fromisoformat(log['timestamp']) >= start_date]
+        success = filters['success'] if 'success' in filters else _ANY
+        logs = [log for log in window if success is _ANY or log.get('success') == success]
         
-        logs.sort(key=lambda x: x['timestamp'], reverse=True)
         return logs
     
     def get_system_events(self, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get system events with optional filtering"""
-        events = self.system_events.copy()
+        filters = filters or {}
+        severity = filters['severity'] if 'severity' in filters else _ANY
+        event_type = filters['event_type'] if 'event_type' in filters else _ANY
         
-        if filters:
-            # Filter by severity
-            if 'severity' in filters:
-                events = [event for event in events if event.get('severity') == filters['severity']]
-            
-            # Filter by event type
-            if 'event_type' in filters:
-                events = [event for event in events if event.get('event_type') == filters['event_type']]
+        # Events are appended in timestamp order; iterate backwards for newest first
+        events = [
+            event for event in reversed(self.system_events)
+            if (severity is _ANY or event.get('severity') == severity)
+            and (event_type is _ANY or event.get('event_type') == event_type)
+        ]
         
-        events.sort(key=lambda x: x['timestamp'], reverse=True)
         return events
     
     def generate_compliance_report(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """Generate compliance report"""
-        logs = self.get_audit_logs({
-            'start_date': start_date,
-            'end_date': end_date
-        })
+        # Each buffer is timestamp-ordered, so the report period is one index range per buffer
+        lo, hi = self._date_bounds(self.audit_logs, start_date, end_date)
+        total_actions = hi - lo
         
-        # Analyze compliance metrics
-        total_actions = len(logs)
-        failed_access = len([log for log in self.access_logs 
-                          if not log.get('success', True) and 
-                          start_date <= log['timestamp'] <= end_date])
+        lo, hi = self._date_bounds(self.access_logs, start_date, end_date)
+        failed_access = sum(1 for log in itertools.islice(self.access_logs, lo, hi)
+                            if not log.get('success', True))
         
-        critical_events = len([event for event in self.system_events 
-                            if event.get('severity') == 'critical' and
-                            start_date <= event['timestamp'] <= end_date])
+        lo, hi = self._date_bounds(self.system_events, start_date, end_date)
+        critical_events = sum(1 for event in itertools.islice(self.system_events, lo, hi)
+                              if event.get('severity') == 'critical')
         
         return {
             'report_period': f"{start_date} to {end_date}",
@@ -225,20 +288,19 @@ class AuditLogger:
             'recommendations': self._generate_compliance_recommendations(failed_access, critical_events)
         }
     
+    def serialize(self, entries: List[Dict[str, Any]]) -> bytes:
+        """Encode log entries as a JSON response body"""
+        # Entry values are caller-supplied; anything orjson cannot encode falls back to str()
+        return orjson.dumps(entries, default=str)
+    
     def _get_resource_type(self, resource: str) -> str:
         """Determine resource type from resource identifier"""
-        if '/incidents' in resource:
-            return 'incident'
-        elif '/alerts' in resource:
-            return 'alert'
-        elif '/metrics' in resource:
-            return 'metrics'
-        elif '/users' in resource:
-            return 'user'
-        elif '/system' in resource:
-            return 'system'
-        else:
-            return 'unknown'
+        # Path segments that follow a '/', mapped in one dict lookup each
+        for segment in resource.split('/')[1:]:
+            resource_type = _RESOURCE_TYPES.get(segment)
+            if resource_type is not None:
+                return resource_type
+        return 'unknown'
     
     def _generate_compliance_recommendations(self, failed_access: int, critical_events: int) -> List[str]:
         """Generate compliance recommendations"""
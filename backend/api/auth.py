@@ -1,49 +1,84 @@
-import jwt
+import asyncio
+import bcrypt
+import collections
 import hashlib
+import secrets
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import logging
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Seconds a successful password check is remembered before bcrypt runs again
+_AUTH_CACHE_TTL = 60
+
+# Built-in demo accounts are hashed once per process, not per RBACManager
+_ADMIN_HASH = bcrypt.hashpw(b"admin123", bcrypt.gensalt())
+_OPERATOR_HASH = bcrypt.hashpw(b"operator123", bcrypt.gensalt())
+_VIEWER_HASH = bcrypt.hashpw(b"viewer123", bcrypt.gensalt())
+_BOOT_TS = datetime.now().isoformat()
+
+# Permissions granted by create_user when none are given explicitly
+_DEFAULT_ROLE_PERMISSIONS = MappingProxyType({
+    "admin": frozenset(["*"]),
+    "operator": frozenset([
+        "incidents:read", "incidents:create", "incidents:update",
+        "alerts:read", "alerts:acknowledge",
+        "metrics:read", "analytics:read"
+    ]),
+    "viewer": frozenset([
+        "incidents:read", "alerts:read", "metrics:read", "analytics:read"
+    ])
+})
+
+# Seconds between sweeps that drop expired sessions nobody has looked up
+_SESSION_SWEEP_INTERVAL = 60
+
 class RBACManager:
     """Role-Based Access Control (RBAC) System"""
     
     def __init__(self):
+        # Roles and permissions are frozensets so checks are a single hash lookup
         self.users = {
             "admin": {
-                "password_hash": self._hash_password("admin123"),
-                "roles": ["admin", "operator", "viewer"],
-                "permissions": ["*"],
+                "password_hash": _ADMIN_HASH,
+                "roles": frozenset(["admin", "operator", "viewer"]),
+                "permissions": frozenset(["*"]),
                 "active": True,
                 "last_login": None,
-                "created_at": datetime.now().isoformat()
+                "created_at": _BOOT_TS
             },
             "operator": {
-                "password_hash": self._hash_password("operator123"),
-                "roles": ["operator", "viewer"],
-                "permissions": [
+                "password_hash": _OPERATOR_HASH,
+                "roles": frozenset(["operator", "viewer"]),
+                "permissions": frozenset([
                     "incidents:read", "incidents:create", "incidents:update",
                     "alerts:read", "alerts:acknowledge",
                     "metrics:read", "analytics:read"
-                ],
+                ]),
                 "active": True,
                 "last_login": None,
-                "created_at": datetime.now().isoformat()
+                "created_at": _BOOT_TS
             },
             "viewer": {
-                "password_hash": self._hash_password("viewer123"),
-                "roles": ["viewer"],
-                "permissions": [
+                "password_hash": _VIEWER_HASH,
+                "roles": frozenset(["viewer"]),
+                "permissions": frozenset([
                     "incidents:read", "alerts:read", "metrics:read", "analytics:read"
-                ],
+                ]),
                 "active": True,
                 "last_login": None,
-                "created_at": datetime.now().isoformat()
+                "created_at": _BOOT_TS
             }
         }
         
         self.sessions = {}
+        # Tokens of each user's live sessions, kept in step with self.sessions
+        self.sessions_by_user = collections.defaultdict(set)
+        # (username, password digest, stored hash) -> monotonic expiry of a verified login
+        self._auth_cache = {}
         self.permission_matrix = {
             "incidents:read": ["admin", "operator", "viewer"],
             "incidents:create": ["admin", "operator"],
@@ -60,10 +95,35 @@ class RBACManager:
             "users:read": ["admin"],
             "users:write": ["admin"]
         }
+        # Inverse of permission_matrix, so role changes don't rescan every permission
+        role_permissions = {}
+        for permission, allowed_roles in self.permission_matrix.items():
+            for role in allowed_roles:
+                role_permissions.setdefault(role, set()).add(permission)
+        self.role_to_permissions = {role: frozenset(perms) for role, perms in role_permissions.items()}
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _hash_password(self, password: str) -> bytes:
+        """Hash password using bcrypt"""
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    
+    def _verify_password(self, username: str, user: Dict[str, Any], password: str) -> bool:
+        """Check a password against the stored bcrypt hash, reusing recent successes"""
+        # Keyed by a digest of the attempt and the stored hash, so a password
+        # change invalidates the entry and the plaintext is never kept
+        fingerprint = hashlib.blake2b(password.encode(), digest_size=16).digest()
+        key = (username, fingerprint, user["password_hash"])
+        now = time.monotonic()
+        expires = self._auth_cache.get(key)
+        if expires is not None:
+            if expires > now:
+                return True
+            del self._auth_cache[key]
+        
+        # checkpw compares in constant time
+        if not bcrypt.checkpw(password.encode(), user["password_hash"]):
+            return False
+        self._auth_cache[key] = now + _AUTH_CACHE_TTL
+        return True
     
     def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user and return user info"""
@@ -74,7 +134,7 @@ class RBACManager:
         if not user.get("active", False):
             return None
         
-        if user["password_hash"] != self._hash_password(password):
+        if not self._verify_password(username, user, password):
             return None
         
         # Update last login
@@ -82,19 +142,25 @@ class RBACManager:
         
         # Create session
         session_token = self._generate_session_token(username)
+        now = datetime.now()
+        expires_at = now + timedelta(hours=24)
         self.sessions[session_token] = {
             "username": username,
             "roles": user["roles"],
             "permissions": user["permissions"],
-            "created_at": datetime.now().isoformat(),
-            "expires_at": (datetime.now() + timedelta(hours=24)).isoformat()
+            "has_wildcard": "*" in user["permissions"],
+            "created_at": now.isoformat(),
+            "expires_at": expires_at.isoformat(),
+            # Epoch copy of expires_at, compared on every validation
+            "expires_at_ts": expires_at.timestamp()
         }
+        self.sessions_by_user[username].add(session_token)
         
         logger.info(f"User {username} authenticated successfully")
         return {
             "username": username,
-            "roles": user["roles"],
-            "permissions": user["permissions"],
+            "roles": list(user["roles"]),
+            "permissions": list(user["permissions"]),
             "session_token": session_token
         }
     
@@ -105,26 +171,34 @@ class RBACManager:
             return None
         
         # Check if session expired
-        if datetime.fromisoformat(session["expires_at"]) < datetime.now():
+        if session["expires_at_ts"] < time.time():
             # Remove expired session
-            del self.sessions[session_token]
+            self._drop_session(session_token)
             return None
         
         return session
     
+    def _drop_session(self, session_token: str) -> None:
+        """Remove a session and its entry in the per-user index"""
+        session = self.sessions.pop(session_token)
+        tokens = self.sessions_by_user.get(session["username"])
+        if tokens is not None:
+            tokens.discard(session_token)
+            if not tokens:
+                del self.sessions_by_user[session["username"]]
+    
     def has_permission(self, session_token: str, required_permission: str) -> bool:
         """Check if user has required permission"""
         session = self.validate_session(session_token)
         if not session:
             return False
         
-        user_permissions = session.get("permissions", [])
-        
-        # Check for wildcard permission
-        if "*" in user_permissions:
-            return True
-        
-        return required_permission in user_permissions
+        return self.session_has_permission(session, required_permission)
+    
+    def session_has_permission(self, session: Dict[str, Any], required_permission: str) -> bool:
+        """Check a permission against an already validated session"""
+        # Wildcard is resolved once when the session is created
+        return session["has_wildcard"] or required_permission in session["permissions"]
     
     def has_role(self, session_token: str, required_role: str) -> bool:
         """Check if user has required role"""
@@ -132,8 +206,11 @@ class RBACManager:
         if not session:
             return False
         
-        user_roles = session.get("roles", [])
-        return required_role in user_roles
+        return self.session_has_role(session, required_role)
+    
+    def session_has_role(self, session: Dict[str, Any], required_role: str) -> bool:
+        """Check a role against an already validated session"""
+        return required_role in session["roles"]
     
     def get_user_info(self, session_token: str) -> Optional[Dict[str, Any]]:
         """Get user information from session"""
@@ -144,15 +221,15 @@ class RBACManager:
         username = session.get("username")
         return {
             "username": username,
-            "roles": session.get("roles", []),
-            "permissions": session.get("permissions", []),
+            "roles": list(session["roles"]),
+            "permissions": list(session["permissions"]),
             "user_data": self.users.get(username, {})
         }
     
     def logout(self, session_token: str) -> bool:
         """Logout user by invalidating session"""
         if session_token in self.sessions:
-            del self.sessions[session_token]
+            self._drop_session(session_token)
             logger.info(f"User logged out, session invalidated: {session_token}")
             return True
         return False
@@ -162,25 +239,12 @@ class RBACManager:
         """Create new user (admin only)"""
         if permissions is None:
             # Default permissions based on highest role
-            role_permissions = {
-                "admin": ["*"],
-                "operator": [
-                    "incidents:read", "incidents:create", "incidents:update",
-                    "alerts:read", "alerts:acknowledge",
-                    "metrics:read", "analytics:read"
-                ],
-                "viewer": [
-                    "incidents:read", "alerts:read", "metrics:read", "analytics:read"
-                ]
-            }
-            permissions = []
-            for role in roles:
-                permissions.extend(role_permissions.get(role, []))
+            permissions = frozenset().union(*(_DEFAULT_ROLE_PERMISSIONS.get(role, ()) for role in roles))
         
         self.users[username] = {
             "password_hash": self._hash_password(password),
-            "roles": roles,
-            "permissions": list(set(permissions)),
+            "roles": frozenset(roles),
+            "permissions": frozenset(permissions),
             "active": True,
             "last_login": None,
             "created_at": datetime.now().isoformat(),
@@ -199,14 +263,10 @@ class RBACManager:
         user = self.users[username]
         
         # Calculate new permissions
-        new_permissions = []
-        for role in new_roles:
-            for permission, allowed_roles in self.permission_matrix.items():
-                if role in allowed_roles:
-                    new_permissions.append(permission)
+        new_permissions = frozenset().union(*(self.role_to_permissions.get(role, ()) for role in new_roles))
         
-        user["roles"] = new_roles
-        user["permissions"] = list(set(new_permissions))
+        user["roles"] = frozenset(new_roles)
+        user["permissions"] = new_permissions
         user["updated_by"] = updated_by
         user["updated_at"] = datetime.now().isoformat()
         
@@ -224,13 +284,8 @@ class RBACManager:
         user["deactivated_at"] = datetime.now().isoformat()
         
         # Invalidate all sessions for this user
-        sessions_to_remove = []
-        for token, session in self.sessions.items():
-            if session.get("username") == username:
-                sessions_to_remove.append(token)
-        
-        for token in sessions_to_remove:
-            del self.sessions[token]
+        for token in self.sessions_by_user.pop(username, ()):
+            self.sessions.pop(token, None)
         
         logger.info(f"User {username} deactivated")
         return {"message": f"User {username} deactivated successfully"}
@@ -241,23 +296,33 @@ class RBACManager:
     
     def get_active_sessions(self) -> List[Dict[str, Any]]:
         """Get all active sessions (admin only)"""
+        now = time.time()
         return [
             {**session, "session_token": token}
             for token, session in self.sessions.items()
-            if datetime.fromisoformat(session["expires_at"]) > datetime.now()
+            if session["expires_at_ts"] > now
         ]
     
+    def expire_sessions(self) -> int:
+        """Drop every expired session and return how many were removed"""
+        now = time.time()
+        expired = [token for token, session in self.sessions.items() if session["expires_at_ts"] < now]
+        for token in expired:
+            self._drop_session(token)
+        return len(expired)
+    
+    async def sweep_sessions(self, interval: float = _SESSION_SWEEP_INTERVAL) -> None:
+        """Periodically expire sessions until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.expire_sessions()
+            if removed:
+                logger.info("Expired %d sessions", removed)
+    
     def _generate_session_token(self, username: str) -> str:
         """Generate secure session token"""
-        payload = {
-            "username": username,
-            "timestamp": datetime.now().isoformat(),
-            "random": str(hash(username + str(datetime.now().timestamp())))
-        }
-        
-        # In production, use proper JWT with secret key
-        token = jwt.encode(payload, "your-secret-key", algorithm="HS256")
-        return token.decode('utf-8')
+        # Sessions are looked up server-side, so an opaque random token is enough
+        return secrets.token_urlsafe(32)
 
 # Global RBAC manager instance
 rbac_manager = RBACManager()
@@ -1,14 +1,24 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
-import requests
-import json
+import asyncio
+import collections
+import functools
+import httpx
+import itertools
+import orjson
 import random
 from datetime import datetime, timedelta
+from urllib.parse import parse_qs
 import os
+import time
 import logging
+import logging.handlers
+import queue
 from ai_engine import ai_engine
 from alerting import alert_manager
 from audit import audit_logger
@@ -18,6 +28,13 @@ from workflows import workflow_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+# Handlers run on a listener thread; request paths, audit logging included,
+# only enqueue the record
+_log_queue = queue.SimpleQueue()
+_root_logger = logging.getLogger()
+log_listener = logging.handlers.QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="SRE Dashboard API", version="2.0.0")
@@ -25,6 +42,43 @@ app = FastAPI(title="SRE Dashboard API", version="2.0.0")
 # Security
 security = HTTPBearer(auto_error=False)
 
+def json_response(content: Any) -> Response:
+    """Encode plain dict/list content with orjson, skipping FastAPI's generic encoder"""
+    return Response(
+        orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
+
+# Shared keep-alive pool for health checks and Prometheus queries; the
+# transport retries a failed connection attempt once
+http_client = httpx.AsyncClient(
+    timeout=5.0,
+    transport=httpx.AsyncHTTPTransport(
+        retries=1,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    )
+)
+PROMETHEUS_QUERY_URL = "http://prometheus:9090/api/v1/query"
+# Background task that drops expired sessions, started with the app
+session_sweeper: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_background_workers():
+    """Start background workers bound to the running event loop"""
+    global session_sweeper
+    alert_manager.start_notifier(asyncio.get_running_loop())
+    session_sweeper = asyncio.create_task(rbac_manager.sweep_sessions())
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """Stop background workers and release their pooled connections"""
+    if session_sweeper is not None:
+        session_sweeper.cancel()
+    await alert_manager.close()
+    await http_client.aclose()
+    # Flushes records still queued
+    log_listener.stop()
+
 # Authentication endpoints
 @app.post("/auth/login")
 async def login(credentials: Dict[str, str]):
@@ -78,24 +132,45 @@ async def get_current_user(session_data: Dict[str, str]):
 
 # RBAC-protected endpoints
 def require_permission(permission: str):
-    """Decorator to require specific permission"""
-    def decorator(func):
-        async def wrapper(session_data: Dict[str, str], *args, **kwargs):
-            session_token = session_data.get("session_token")
-            if not rbac_manager.has_permission(session_token, permission):
-                raise HTTPException(status_code=403, detail=f"Permission required: {permission}")
-            return await func(session_data, *args, **kwargs)
-        return wrapper
-    return decorator
+    """Dependency to require specific permission"""
+    def dependency(request: Request) -> None:
+        # The session middleware already validated the token for this request
+        session = getattr(request.state, "session", None)
+        if not session or not rbac_manager.session_has_permission(session, permission):
+            raise HTTPException(status_code=403, detail=f"Permission required: {permission}")
+    return dependency
 
 def require_role(role: str):
-    """Decorator to require specific role"""
+    """Dependency to require specific role"""
+    def dependency(request: Request) -> None:
+        session = getattr(request.state, "session", None)
+        if not session or not rbac_manager.session_has_role(session, role):
+            raise HTTPException(status_code=403, detail=f"Role required: {role}")
+    return dependency
+
+def ttl_cache(seconds: float):
+    """Decorator to share one result of an argument-less endpoint for a few seconds"""
     def decorator(func):
-        async def wrapper(session_data: Dict[str, str], *args, **kwargs):
-            session_token = session_data.get("session_token")
-            if not rbac_manager.has_role(session_token, role):
-                raise HTTPException(status_code=403, detail=f"Role required: {role}")
-            return await func(session_data, *args, **kwargs)
+        state = {"task": None, "expires": 0.0}
+        
+        @functools.wraps(func)
+        async def wrapper():
+            task = state["task"]
+            now = time.monotonic()
+            # Refresh once expired or after a failure; callers arriving while a
+            # refresh is in flight await the same task instead of starting another
+            if task is None or now >= state["expires"] or (
+                    task.done() and (task.cancelled() or task.exception() is not None)):
+                task = state["task"] = asyncio.ensure_future(func())
+                state["expires"] = now + seconds
+            # Shielded so one disconnecting client does not cancel it for the rest
+            return await asyncio.shield(task)
+        
+        def cache_clear() -> None:
+            """Make the next call recompute rather than reuse the shared result"""
+            state["task"] = None
+        
+        wrapper.cache_clear = cache_clear
         return wrapper
     return decorator
 
@@ -108,30 +183,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (analytics reports, audit logs) for browser clients;
+# level 6 trades a little ratio for much less CPU than the default 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 # Session validation middleware
-@app.middleware("http")
-async def add_session_token(request, call_next):
+class SessionTokenMiddleware:
     """Add session token validation to requests"""
-    # Skip auth for login endpoint
-    if request.url.path.startswith("/auth/"):
-        response = await call_next(request)
-        return response
     
-    # Check for session token in headers
-    session_token = request.headers.get("X-Session-Token")
-    if not session_token:
-        session_token = request.query_params.get("session_token")
+    def __init__(self, app):
+        self.app = app
     
-    if session_token:
-        # Validate session
-        session = rbac_manager.validate_session(session_token)
-        if session:
-            request.state.session = session
-        else:
-            request.state.session = None
-    
-    response = await call_next(request)
-    return response
+    async def __call__(self, scope, receive, send):
+        # Skip auth for login endpoint; plain ASGI, so no Request is built here
+        if scope["type"] != "http" or scope["path"].startswith("/auth/"):
+            await self.app(scope, receive, send)
+            return
+        
+        # Check for session token in headers
+        session_token = None
+        for name, value in scope["headers"]:
+            if name == b"x-session-token":
+                session_token = value.decode("latin-1")
+                break
+        if not session_token and scope["query_string"]:
+            values = parse_qs(scope["query_string"].decode("latin-1")).get("session_token")
+            session_token = values[-1] if values else None
+        
+        if session_token:
+            # Validate session
+            scope.setdefault("state", {})["session"] = rbac_manager.validate_session(session_token)
+        
+        await self.app(scope, receive, send)
+
+app.add_middleware(SessionTokenMiddleware)
 
 class HealthStatus(BaseModel):
     status: str
@@ -147,8 +232,23 @@ class Incident(BaseModel):
     resolved_at: Optional[str] = None
     description: str
     ai_analysis: Optional[str] = None
-
-class MetricsData(BaseModel):
+    # Plain-dict form shared by the engines; rebuilt after any field changes
+    _as_dict: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._as_dict = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Field values as a dict, built once per change; callers must not mutate it"""
+        if self._as_dict is None:
+            self._as_dict = self.model_dump()
+        return self._as_dict
+
+# Internal history record, never a request body, so no validation is needed
+@dataclass(slots=True)
+class MetricsData:
     timestamp: str
     request_count: int
     error_count: int
@@ -157,28 +257,68 @@ class MetricsData(BaseModel):
 
 # In-memory storage for demo
 incidents_db = []
-metrics_history = []
+# Same incidents keyed by id, for lookups without scanning incidents_db
+incidents_by_id: Dict[str, Incident] = {}
+# Incident ids are never reused, even if incidents are later removed
+_incident_ids = itertools.count(1)
+# Latest 100 metric samples; deque drops the oldest in O(1)
+metrics_history = collections.deque(maxlen=100)
+
+# Weak ETag of the incident collection, replaced on every change. The random
+# prefix keeps tags from one process run from matching another's
+_incident_versions = itertools.count()
+_incidents_etag_prefix = os.urandom(4).hex()
+incidents_etag = f'W/"{_incidents_etag_prefix}-{next(_incident_versions)}"'
+
+def _incidents_changed() -> None:
+    """Issue a new incident collection ETag"""
+    global incidents_etag
+    incidents_etag = f'W/"{_incidents_etag_prefix}-{next(_incident_versions)}"'
+
+def _add_incident(incident: Incident) -> None:
+    """Store an incident under its id in both the ordered list and the index"""
+    # No await between the writes, so handlers never observe one without the other
+    incidents_db.append(incident)
+    incidents_by_id[incident.id] = incident
 
 @app.get("/")
 async def root():
     return {"message": "SRE Dashboard API is running"}
 
+async def _is_healthy(url: str) -> bool:
+    """Whether a health endpoint answers 200"""
+    try:
+        response = await http_client.get(url)
+        return response.status_code == 200
+    except Exception:
+        return False
+
 @app.get("/health", response_model=HealthStatus)
 async def get_health_status():
     """Get overall system health status"""
-    try:
-        # Check sample app health
-        app_response = requests.get("http://app:3000/health", timeout=5)
-        app_healthy = app_response.status_code == 200
-    except:
-        app_healthy = False
-    
-    # Check Prometheus health
-    try:
-        prom_response = requests.get("http://prometheus:9090/-/healthy", timeout=5)
-        prom_healthy = prom_response.status_code == 200
-    except:
-        prom_healthy = False
+    return Response(await _health_body(), media_type="application/json")
+
+# Probe URLs and every possible per-service entry of the health payload
+_SAMPLE_APP_HEALTH_URL = "http://app:3000/health"
+_PROMETHEUS_HEALTH_URL = "http://prometheus:9090/-/healthy"
+_SAMPLE_APP_STATUS = {
+    True: {"status": "healthy", "url": "http://app:3000"},
+    False: {"status": "unhealthy", "url": "http://app:3000"}
+}
+_PROMETHEUS_STATUS = {
+    True: {"status": "healthy", "url": "http://prometheus:9090"},
+    False: {"status": "unhealthy", "url": "http://prometheus:9090"}
+}
+_OTEL_STATUS = {"status": "healthy", "url": "http://otel:4317"}
+
+@ttl_cache(2)
+async def _health_body() -> bytes:
+    """Check downstream health and encode the status once for every probe in the window"""
+    # Check sample app and Prometheus health concurrently
+    app_healthy, prom_healthy = await asyncio.gather(
+        _is_healthy(_SAMPLE_APP_HEALTH_URL),
+        _is_healthy(_PROMETHEUS_HEALTH_URL)
+    )
     
     overall_status = "healthy" if app_healthy and prom_healthy else "degraded"
     
@@ -186,16 +326,16 @@ async def get_health_status():
         status=overall_status,
         timestamp=datetime.now().isoformat(),
         services={
-            "sample_app": {"status": "healthy" if app_healthy else "unhealthy", "url": "http://app:3000"},
-            "prometheus": {"status": "healthy" if prom_healthy else "unhealthy", "url": "http://prometheus:9090"},
-            "otel_collector": {"status": "healthy", "url": "http://otel:4317"}
+            "sample_app": _SAMPLE_APP_STATUS[app_healthy],
+            "prometheus": _PROMETHEUS_STATUS[prom_healthy],
+            "otel_collector": _OTEL_STATUS
         }
-    )
+    ).model_dump_json().encode()
 
 @app.get("/alerts", response_model=List[Dict[str, Any]])
 async def get_alerts():
     """Get all active alerts"""
-    return alert_manager.get_active_alerts()
+    return [alert.to_dict() for alert in alert_manager.get_active_alerts()]
 
 @app.post("/alerts/{alert_id}/acknowledge")
 async def acknowledge_alert(alert_id: str):
@@ -234,17 +374,17 @@ async def resolve_alert(alert_id: str):
 @app.get("/audit/logs")
 async def get_audit_logs(filters: Dict[str, Any] = None):
     """Get audit logs"""
-    return audit_logger.get_audit_logs(filters)
+    return Response(audit_logger.serialize(audit_logger.get_audit_logs(filters)), media_type="application/json")
 
 @app.get("/audit/access-logs")
 async def get_access_logs(filters: Dict[str, Any] = None):
     """Get access logs"""
-    return audit_logger.get_access_logs(filters)
+    return Response(audit_logger.serialize(audit_logger.get_access_logs(filters)), media_type="application/json")
 
 @app.get("/audit/system-events")
 async def get_system_events(filters: Dict[str, Any] = None):
     """Get system events"""
-    return audit_logger.get_system_events(filters)
+    return Response(audit_logger.serialize(audit_logger.get_system_events(filters)), media_type="application/json")
 
 @app.get("/audit/compliance-report")
 async def get_compliance_report(start_date: str, end_date: str):
@@ -254,35 +394,33 @@ async def get_compliance_report(start_date: str, end_date: str):
 @app.get("/analytics/performance")
 async def get_performance_report(time_range: str = "24h"):
     """Generate performance analytics report"""
-    return analytics_engine.generate_performance_report(time_range)
+    return json_response(analytics_engine.generate_performance_report(time_range))
 
 @app.get("/analytics/incidents")
 async def get_incident_report(time_range: str = "7d"):
     """Generate incident analytics report"""
-    return analytics_engine.generate_incident_report(time_range)
+    return json_response(analytics_engine.generate_incident_report(time_range))
 
 @app.get("/analytics/sla")
 async def get_sla_report(time_range: str = "30d"):
     """Generate SLA analytics report"""
-    return analytics_engine.generate_sla_report(time_range)
+    return json_response(analytics_engine.generate_sla_report(time_range))
 
 @app.get("/analytics/capacity")
 async def get_capacity_planning_report():
     """Generate capacity planning report"""
-    return analytics_engine.generate_capacity_planning_report()
+    return json_response(analytics_engine.generate_capacity_planning_report())
 
-@app.get("/workflows")
-@require_permission("incidents:read")
+@app.get("/workflows", dependencies=[Depends(require_permission("incidents:read"))])
 async def get_available_workflows():
     """Get available automated workflows"""
-    return workflow_engine.get_available_workflows()
+    return json_response(workflow_engine.get_available_workflows())
 
-@app.post("/workflows/{workflow_name}/trigger")
-@require_permission("incidents:update")
+@app.post("/workflows/{workflow_name}/trigger", dependencies=[Depends(require_permission("incidents:update"))])
 async def trigger_workflow(workflow_name: str, incident_id: str, request: Request):
     """Trigger automated workflow for incident"""
     # Get incident data
-    incident = next((i for i in incidents_db if i.id == incident_id), None)
+    incident = incidents_by_id.get(incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
@@ -292,7 +430,7 @@ async def trigger_workflow(workflow_name: str, incident_id: str, request: Reques
         "triggered_at": datetime.now().isoformat()
     }
     
-    result = workflow_engine.trigger_workflow(workflow_name, incident.dict(), trigger_data)
+    result = workflow_engine.trigger_workflow(workflow_name, incident.as_dict(), trigger_data)
     
     # Log workflow trigger
     audit_logger.log_user_action(
@@ -308,16 +446,20 @@ async def trigger_workflow(workflow_name: str, incident_id: str, request: Reques
     
     return result
 
-@app.get("/workflows/{workflow_id}/status")
-@require_permission("incidents:read")
+@app.get("/workflows/{workflow_id}/status", dependencies=[Depends(require_permission("incidents:read"))])
 async def get_workflow_status(workflow_id: str):
     """Get workflow execution status"""
-    return workflow_engine.get_workflow_status(workflow_id)
+    return json_response(workflow_engine.get_workflow_status(workflow_id))
 
-@app.get("/analytics/dashboard")
-@require_permission("analytics:read")
+@app.get("/analytics/dashboard", dependencies=[Depends(require_permission("analytics:read"))])
+@ttl_cache(30)
 async def get_dashboard_analytics():
     """Get comprehensive dashboard analytics"""
+    # Reports are CPU-bound; build them off the event loop
+    return json_response(await asyncio.to_thread(_dashboard_reports))
+
+def _dashboard_reports() -> Dict[str, Any]:
+    """Collect the dashboard's sub-reports"""
     return {
         "performance_summary": analytics_engine.generate_performance_report("24h"),
         "incident_summary": analytics_engine.generate_incident_report("7d"),
@@ -326,48 +468,39 @@ async def get_dashboard_analytics():
         "generated_at": datetime.now().isoformat()
     }
 
-@app.get("/workflows/history")
-@require_permission("incidents:read")
+@app.get("/workflows/history", dependencies=[Depends(require_permission("incidents:read"))])
 async def get_workflow_history(limit: int = 50):
     """Get workflow execution history"""
-    return workflow_engine.get_workflow_history(limit)
-
-@app.get("/metrics")
-@require_permission("metrics:read")
+    return json_response(workflow_engine.get_workflow_history(limit))
+
+# Prometheus series read on every /metrics poll, fetched in one instant query
+PROMETHEUS_SERIES = ("http_requests_total", "http_errors_total", "http_response_time_avg", "app_uptime")
+PROMETHEUS_SERIES_QUERY = '{__name__=~"%s"}' % "|".join(PROMETHEUS_SERIES)
+_PROMETHEUS_SERIES_PARAMS = {"query": PROMETHEUS_SERIES_QUERY}
+
+def _prometheus_values(response: httpx.Response) -> Dict[str, Any]:
+    """First sample value of each queried series by metric name, 0 when a series is absent"""
+    values = dict.fromkeys(PROMETHEUS_SERIES, 0)
+    seen = set()
+    for series in orjson.loads(response.content)["data"]["result"]:
+        name = series["metric"].get("__name__")
+        if name in values and name not in seen:
+            seen.add(name)
+            values[name] = series["value"][1]
+    return values
+
+@app.get("/metrics", dependencies=[Depends(require_permission("metrics:read"))])
+@ttl_cache(5)
 async def get_metrics():
     """Get metrics from Prometheus and evaluate alerts"""
     try:
-        # Get request count
-        response = requests.get(
-            "http://prometheus:9090/api/v1/query",
-            params={"query": "http_requests_total"},
-            timeout=5
-        )
-        request_count = int(response.json()["data"]["result"][0]["value"][1]) if response.json()["data"]["result"] else 0
-        
-        # Get error count
-        response = requests.get(
-            "http://prometheus:9090/api/v1/query",
-            params={"query": "http_errors_total"},
-            timeout=5
-        )
-        error_count = int(response.json()["data"]["result"][0]["value"][1]) if response.json()["data"]["result"] else 0
-        
-        # Get average response time
-        response = requests.get(
-            "http://prometheus:9090/api/v1/query",
-            params={"query": "http_response_time_avg"},
-            timeout=5
-        )
-        response_time = float(response.json()["data"]["result"][0]["value"][1]) if response.json()["data"]["result"] else 0.0
-        
-        # Get uptime
-        response = requests.get(
-            "http://prometheus:9090/api/v1/query",
-            params={"query": "app_uptime"},
-            timeout=5
-        )
-        uptime = int(response.json()["data"]["result"][0]["value"][1]) if response.json()["data"]["result"] else 0
+        # Request count, error count, average response time and uptime in one round trip
+        response = await http_client.get(PROMETHEUS_QUERY_URL, params=_PROMETHEUS_SERIES_PARAMS)
+        values = _prometheus_values(response)
+        request_count = int(values["http_requests_total"])
+        error_count = int(values["http_errors_total"])
+        response_time = float(values["http_response_time_avg"])
+        uptime = int(values["app_uptime"])
         
         # Calculate derived metrics
         error_rate = (error_count / max(request_count, 1)) * 100
@@ -384,9 +517,13 @@ async def get_metrics():
         }
         
         # Store in history and add to analytics engine
-        metrics_history.append(metrics)
-        if len(metrics_history) > 100:
-            metrics_history.pop(0)
+        metrics_history.append(MetricsData(
+            timestamp=metrics["timestamp"],
+            request_count=request_count,
+            error_count=error_count,
+            response_time_avg=response_time,
+            uptime=uptime
+        ))
         
         analytics_engine.add_metrics_data(metrics)
         
@@ -395,7 +532,7 @@ async def get_metrics():
         
         return {
             "metrics": metrics,
-            "triggered_alerts": triggered_alerts,
+            "triggered_alerts": [alert.to_dict() for alert in triggered_alerts],
             "total_active_alerts": len(alert_manager.get_active_alerts())
         }
         
@@ -404,17 +541,21 @@ async def get_metrics():
         return []
 
 @app.get("/incidents", response_model=List[Incident])
-async def get_incidents():
+async def get_incidents(request: Request, response: Response):
     """Get all incidents"""
+    # Unchanged since the client's copy: skip serialising the collection
+    if request.headers.get("if-none-match") == incidents_etag:
+        return Response(status_code=304, headers={"ETag": incidents_etag})
+    response.headers["ETag"] = incidents_etag
     return incidents_db
 
-@app.post("/incidents", response_model=Incident)
-@require_permission("incidents:create")
+@app.post("/incidents", response_model=Incident, dependencies=[Depends(require_permission("incidents:create"))])
 async def create_incident(incident: Incident, request: Request):
     """Create a new incident"""
-    incident.id = str(len(incidents_db) + 1)
+    incident.id = str(next(_incident_ids))
     incident.created_at = datetime.now().isoformat()
-    incidents_db.append(incident)
+    _add_incident(incident)
+    _incidents_changed()
     
     # Log incident creation for audit
     audit_logger.log_user_action(
@@ -425,23 +566,25 @@ async def create_incident(incident: Incident, request: Request):
     )
     
     # Add to analytics engine
-    analytics_engine.add_incident_data(incident.dict())
+    analytics_engine.add_incident_data(incident.as_dict())
+    get_dashboard_analytics.cache_clear()
     
     return incident
 
 @app.post("/incidents/{incident_id}/analyze")
 async def analyze_incident(incident_id: str):
     """Perform advanced AI analysis of incident"""
-    incident = next((i for i in incidents_db if i.id == incident_id), None)
+    incident = incidents_by_id.get(incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
     try:
         # Use advanced AI engine for analysis
-        ai_analysis = ai_engine.analyze_incident(incident.dict())
+        ai_analysis = ai_engine.analyze_incident(incident.as_dict())
         
         # Update incident with AI analysis
-        incident.ai_analysis = json.dumps(ai_analysis, indent=2)
+        incident.ai_analysis = orjson.dumps(ai_analysis, option=orjson.OPT_INDENT_2).decode()
+        _incidents_changed()
         
         # Log AI analysis for audit
         audit_logger.log_incident_lifecycle(
@@ -462,26 +605,28 @@ async def analyze_incident(incident_id: str):
         logger.error(f"AI analysis failed for incident {incident_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="AI analysis failed")
 
+# Mock analyses; only the incident title varies, so one is picked before formatting
+_ANALYSIS_TEMPLATES = (
+    "Root cause analysis for '{title}' indicates a potential service degradation. "
+    "Recommend checking service dependencies and recent deployments. "
+    "Estimated MTTR: 15-30 minutes.",
+    
+    "The incident '{title}' shows patterns consistent with resource exhaustion. "
+    "Suggested actions: scale horizontally, check memory usage, review recent traffic spikes. "
+    "Impact assessment: Medium severity affecting ~20% of users.",
+    
+    "Analysis of '{title}' suggests external dependency failure. "
+    "Immediate action: Implement circuit breaker pattern, monitor third-party SLAs. "
+    "Preventive measures: Add retry logic with exponential backoff."
+)
+
 def generate_ai_analysis(incident: Incident) -> str:
     """Generate AI-powered incident analysis"""
     # This is a mock implementation - replace with actual AI service call
-    analyses = [
-        f"Root cause analysis for '{incident.title}' indicates a potential service degradation. "
-        f"Recommend checking service dependencies and recent deployments. "
-        f"Estimated MTTR: 15-30 minutes.",
-        
-        f"The incident '{incident.title}' shows patterns consistent with resource exhaustion. "
-        f"Suggested actions: scale horizontally, check memory usage, review recent traffic spikes. "
-        f"Impact assessment: Medium severity affecting ~20% of users.",
-        
-        f"Analysis of '{incident.title}' suggests external dependency failure. "
-        f"Immediate action: Implement circuit breaker pattern, monitor third-party SLAs. "
-        f"Preventive measures: Add retry logic with exponential backoff."
-    ]
-    
-    return random.choice(analyses)
+    return random.choice(_ANALYSIS_TEMPLATES).format(title=incident.title)
 
 @app.get("/sla")
+@ttl_cache(10)
 async def get_sla_metrics():
     """Get SLA and availability metrics"""
     try:
@@ -538,13 +683,19 @@ async def generate_demo_incidents():
         }
     ]
     
+    # One clock read stamps the whole batch
+    now = datetime.now()
+    created_at = now.isoformat()
+    resolved_at = (now - timedelta(minutes=30)).isoformat()
     for incident_data in demo_incidents:
-        incident = Incident(**incident_data)
-        incident.id = str(len(incidents_db) + 1)
-        incident.created_at = datetime.now().isoformat()
-        if incident.status == "resolved":
-            incident.resolved_at = (datetime.now() - timedelta(minutes=30)).isoformat()
-        incidents_db.append(incident)
+        incident = Incident(
+            **incident_data,
+            id=str(next(_incident_ids)),
+            created_at=created_at,
+            resolved_at=resolved_at if incident_data["status"] == "resolved" else None
+        )
+        _add_incident(incident)
+    _incidents_changed()
     
     return {"message": f"Generated {len(demo_incidents)} demo incidents"}
 
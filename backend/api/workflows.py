@@ -1,146 +1,184 @@
 import asyncio
+import collections
+import functools
+import itertools
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import logging
-import json
+import operator
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Finished runs kept for history; older ones are forgotten
+_WORKFLOW_HISTORY_LIMIT = 10_000
+
+# Steps allowed to run at once across all workflow runs
+_MAX_CONCURRENT_STEPS = 16
+
+# Step action -> WorkflowEngine coroutine that simulates it
+_STEP_ACTIONS = MappingProxyType({
+    "send_alert": "_send_alert",
+    "create_channel": "_create_communication_channel",
+    "scale_service": "_scale_service",
+    "configure_cache": "_configure_cache",
+    "restart_service": "_restart_service",
+    "isolate_system": "_isolate_system",
+    "block_ip": "_block_malicious_ips",
+    "security_scan": "_perform_security_scan"
+})
+
+@dataclass(slots=True, frozen=True)
+class Step:
+    """A single automated action within a workflow"""
+    name: str
+    action: str
+    target: str
+    timeout: int
+    automated: bool = True
+    conditions: Tuple[str, ...] = ()
+    # Adjacent steps sharing a group run concurrently
+    parallel_group: Optional[str] = None
+
+@dataclass(slots=True, frozen=True)
+class Workflow:
+    """Static definition of an incident response workflow"""
+    name: str
+    description: str
+    triggers: Tuple[str, ...]
+    steps: Tuple[Step, ...]
+    auto_execute: bool
+
+# Comparison prefixes accepted in "metric:<op><threshold>" triggers
+_TRIGGER_OPERATORS = MappingProxyType({
+    ">": operator.gt,
+    "<": operator.lt
+})
+
+def _compile_trigger(trigger: str) -> Callable[[Dict[str, Any]], bool]:
+    """Turn a trigger string into a predicate over an incoming event"""
+    key, sep, expected = trigger.partition(":")
+    if not sep:
+        # Bare triggers such as "database_error" match when the event flags them
+        return lambda event: bool(event.get(key))
+    
+    compare = _TRIGGER_OPERATORS.get(expected[:1])
+    if compare is None:
+        return lambda event: event.get(key) == expected
+    
+    threshold = float(expected[1:])
+    # An event that doesn't report the metric can't cross its threshold
+    return lambda event: event.get(key) is not None and compare(event[key], threshold)
+
+# Built-in response workflows, shared read-only by every engine
+_WORKFLOWS = MappingProxyType({
+    "high_severity_incident": Workflow(
+        name="High Severity Incident Response",
+        description="Automated response for critical incidents",
+        triggers=("severity:critical", "severity:high"),
+        steps=(
+            Step(name="immediate_notification", action="send_alert", target="on_call_sre", timeout=60, parallel_group="notify"),
+            Step(name="create_war_room", action="create_channel", target="slack_war_room", timeout=120, parallel_group="notify"),
+            Step(name="escalate_management", action="send_email", target="management", timeout=300)
+        ),
+        auto_execute=True
+    ),
+    "service_degradation": Workflow(
+        name="Service Degradation Response",
+        description="Automated response for performance issues",
+        triggers=("response_time:>1000", "error_rate:>5", "availability:<99"),
+        steps=(
+            Step(name="scale_horizontal", action="scale_service", target="web_servers", timeout=300, conditions=("cpu_usage>80", "memory_usage>80")),
+            Step(name="enable_cache", action="configure_cache", target="application_cache", timeout=180),
+            Step(name="restart_services", action="restart_service", target="affected_services", timeout=120, conditions=("error_rate>10",))
+        ),
+        auto_execute=False
+    ),
+    "database_connectivity": Workflow(
+        name="Database Connectivity Issues",
+        description="Automated response for database problems",
+        triggers=("database_error", "connection_timeout"),
+        steps=(
+            Step(name="check_connection_pool", action="validate_connections", target="database_pool", timeout=60),
+            Step(name="failover_to_backup", action="switch_database", target="backup_database", timeout=180, conditions=("primary_db_unavailable",)),
+            Step(name="restart_database_service", action="restart_service", target="database_service", timeout=120)
+        ),
+        auto_execute=False
+    ),
+    "security_incident": Workflow(
+        name="Security Incident Response",
+        description="Automated response for security events",
+        triggers=("security_breach", "unauthorized_access", "malware_detected"),
+        steps=(
+            Step(name="isolate_affected_systems", action="isolate_system", target="compromised_hosts", timeout=300, parallel_group="contain"),
+            Step(name="block_malicious_ips", action="block_ip", target="firewall", timeout=60, parallel_group="contain"),
+            Step(name="rotate_credentials", action="rotate_passwords", target="affected_accounts", timeout=120, parallel_group="contain"),
+            Step(name="security_scan", action="security_scan", target="affected_systems", timeout=600)
+        ),
+        auto_execute=True
+    )
+})
+
+def _step_groups(steps: Tuple[Step, ...]) -> Tuple[Tuple[Step, ...], ...]:
+    """Split steps into execution groups; adjacent steps sharing a parallel_group run together"""
+    groups = []
+    for key, group in itertools.groupby(steps, key=lambda step: step.parallel_group):
+        if key is None:
+            groups.extend((step,) for step in group)
+        else:
+            groups.append(tuple(group))
+    return tuple(groups)
+
 class WorkflowEngine:
     """Automated incident response and workflow management"""
     
+    __slots__ = (
+        "workflows", "active_workflow_runs", "workflow_history", "_history_by_id",
+        "_run_ids", "_step_slots", "_plans", "_trigger_predicates", "_available_workflows"
+    )
+    
     def __init__(self):
-        self.workflows = {
-            "high_severity_incident": {
-                "name": "High Severity Incident Response",
-                "description": "Automated response for critical incidents",
-                "triggers": ["severity:critical", "severity:high"],
-                "steps": [
-                    {
-                        "name": "immediate_notification",
-                        "action": "send_alert",
-                        "target": "on_call_sre",
-                        "timeout": 60,
-                        "automated": True
-                    },
-                    {
-                        "name": "create_war_room",
-                        "action": "create_channel",
-                        "target": "slack_war_room",
-                        "timeout": 120,
-                        "automated": True
-                    },
-                    {
-                        "name": "escalate_management",
-                        "action": "send_email",
-                        "target": "management",
-                        "timeout": 300,
-                        "automated": True
-                    }
-                ],
-                "auto_execute": True
-            },
-            "service_degradation": {
-                "name": "Service Degradation Response",
-                "description": "Automated response for performance issues",
-                "triggers": ["response_time:>1000", "error_rate:>5", "availability:<99"],
-                "steps": [
-                    {
-                        "name": "scale_horizontal",
-                        "action": "scale_service",
-                        "target": "web_servers",
-                        "timeout": 300,
-                        "automated": True,
-                        "conditions": ["cpu_usage>80", "memory_usage>80"]
-                    },
-                    {
-                        "name": "enable_cache",
-                        "action": "configure_cache",
-                        "target": "application_cache",
-                        "timeout": 180,
-                        "automated": True
-                    },
-                    {
-                        "name": "restart_services",
-                        "action": "restart_service",
-                        "target": "affected_services",
-                        "timeout": 120,
-                        "automated": True,
-                        "conditions": ["error_rate>10"]
-                    }
-                ],
-                "auto_execute": False
-            },
-            "database_connectivity": {
-                "name": "Database Connectivity Issues",
-                "description": "Automated response for database problems",
-                "triggers": ["database_error", "connection_timeout"],
-                "steps": [
-                    {
-                        "name": "check_connection_pool",
-                        "action": "validate_connections",
-                        "target": "database_pool",
-                        "timeout": 60,
-                        "automated": True
-                    },
-                    {
-                        "name": "failover_to_backup",
-                        "action": "switch_database",
-                        "target": "backup_database",
-                        "timeout": 180,
-                        "automated": True,
-                        "conditions": ["primary_db_unavailable"]
-                    },
-                    {
-                        "name": "restart_database_service",
-                        "action": "restart_service",
-                        "target": "database_service",
-                        "timeout": 120,
-                        "automated": True
-                    }
-                ],
-                "auto_execute": False
-            },
-            "security_incident": {
-                "name": "Security Incident Response",
-                "description": "Automated response for security events",
-                "triggers": ["security_breach", "unauthorized_access", "malware_detected"],
-                "steps": [
-                    {
-                        "name": "isolate_affected_systems",
-                        "action": "isolate_system",
-                        "target": "compromised_hosts",
-                        "timeout": 300,
-                        "automated": True
-                    },
-                    {
-                        "name": "block_malicious_ips",
-                        "action": "block_ip",
-                        "target": "firewall",
-                        "timeout": 60,
-                        "automated": True
-                    },
-                    {
-                        "name": "rotate_credentials",
-                        "action": "rotate_passwords",
-                        "target": "affected_accounts",
-                        "timeout": 120,
-                        "automated": True
-                    },
-                    {
-                        "name": "security_scan",
-                        "action": "security_scan",
-                        "target": "affected_systems",
-                        "timeout": 600,
-                        "automated": True
-                    }
-                ],
-                "auto_execute": True
-            }
+        self.workflows = _WORKFLOWS
+        
+        # Runs keyed by id so status polls are a dict lookup
+        self.active_workflow_runs = {}
+        # Finished runs ordered by started_at, oldest first, plus an index by id
+        self.workflow_history = collections.deque()
+        self._history_by_id = {}
+        # Ids stay unique once finished runs leave active_workflow_runs
+        self._run_ids = itertools.count(1)
+        # Caps outbound step calls when many runs fire together; the timeout
+        # only starts once a slot is held
+        self._step_slots = asyncio.Semaphore(_MAX_CONCURRENT_STEPS)
+        
+        # Each step's handler and target are bound once, so a run just awaits them
+        actions = {action: getattr(self, name) for action, name in _STEP_ACTIONS.items()}
+        self._plans = {
+            name: tuple(
+                tuple((step, self._bind_step(step, actions)) for step in group)
+                for group in _step_groups(workflow.steps)
+            )
+            for name, workflow in self.workflows.items()
         }
         
-        self.active_workflow_runs = []
-        self.workflow_history = []
+        # Triggers are parsed here once rather than on every event
+        self._trigger_predicates = {
+            name: tuple(_compile_trigger(trigger) for trigger in workflow.triggers)
+            for name, workflow in self.workflows.items()
+        }
+        
+        # Workflow definitions are fixed after construction, so the summary is too
+        self._available_workflows = [
+            {
+                "name": name,
+                "description": workflow.description,
+                "triggers": list(workflow.triggers),
+                "auto_execute": workflow.auto_execute,
+                "step_count": len(workflow.steps)
+            }
+            for name, workflow in self.workflows.items()
+        ]
     
     def trigger_workflow(self, workflow_name: str, incident_data: Dict[str, Any], 
                      trigger_data: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -150,12 +188,12 @@ class WorkflowEngine:
             return {"error": f"Workflow {workflow_name} not found"}
         
         # Check if workflow should auto-execute
-        if not workflow.get("auto_execute", False):
+        if not workflow.auto_execute:
             return {"error": "Workflow requires manual execution"}
         
         # Create workflow run
         workflow_run = {
-            "id": f"workflow_{len(self.active_workflow_runs) + 1}",
+            "id": f"workflow_{next(self._run_ids)}",
             "workflow_name": workflow_name,
             "incident_id": incident_data.get("id"),
             "trigger_data": trigger_data or {},
@@ -165,11 +203,11 @@ class WorkflowEngine:
             "current_step": 0
         }
         
-        self.active_workflow_runs.append(workflow_run)
-        logger.info(f"Workflow {workflow_name} triggered for incident {incident_data.get('id')}")
+        self.active_workflow_runs[workflow_run["id"]] = workflow_run
+        logger.info("Workflow %s triggered for incident %s", workflow_name, incident_data.get("id"))
         
         # Execute workflow steps asynchronously
-        asyncio.create_task(self._execute_workflow(workflow_run, workflow, incident_data))
+        asyncio.create_task(self._execute_workflow(workflow_run, self._plans[workflow_name], incident_data))
         
         return {
             "workflow_id": workflow_run["id"],
@@ -177,74 +215,74 @@ class WorkflowEngine:
             "message": f"Workflow {workflow_name} execution started"
         }
     
-    async def _execute_workflow(self, workflow_run: Dict[str, Any], workflow: Dict[str, Any], 
+    async def _execute_workflow(self, workflow_run: Dict[str, Any], plan: Tuple[Tuple[Tuple[Step, Callable], ...], ...], 
                           incident_data: Dict[str, Any]) -> None:
         """Execute workflow steps"""
-        steps = workflow.get("steps", [])
-        
-        for i, step in enumerate(steps):
-            try:
-                workflow_run["current_step"] = i
-                step_result = await self._execute_step(step, incident_data)
-                
-                workflow_run["steps"].append({
-                    "step_name": step["name"],
-                    "action": step["action"],
-                    "status": "completed",
-                    "completed_at": datetime.now().isoformat(),
-                    "result": step_result
-                })
-                
-                # Check timeout
-                if "timeout" in step:
-                    await asyncio.sleep(step["timeout"])
-                
-                logger.info(f"Workflow step {step['name']} completed")
-                
-            except Exception as e:
-                workflow_run["steps"].append({
-                    "step_name": step["name"],
-                    "action": step["action"],
-                    "status": "failed",
-                    "completed_at": datetime.now().isoformat(),
-                    "error": str(e)
-                })
-                logger.error(f"Workflow step {step['name']} failed: {str(e)}")
+        for i, group in enumerate(plan):
+            workflow_run["current_step"] = i
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(self._run_step(step, call, incident_data)) for step, call in group]
+            workflow_run["steps"].extend(task.result() for task in tasks)
         
         # Mark workflow as completed
         workflow_run["status"] = "completed"
         workflow_run["completed_at"] = datetime.now().isoformat()
         
         # Move to history
-        self.workflow_history.append(workflow_run)
-        self.active_workflow_runs.remove(workflow_run)
+        self._record_history(workflow_run)
+        del self.active_workflow_runs[workflow_run["id"]]
         
-        logger.info(f"Workflow {workflow_run['workflow_name']} completed")
+        logger.info("Workflow %s completed", workflow_run["workflow_name"])
     
-    async def _execute_step(self, step: Dict[str, Any], incident_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute individual workflow step"""
-        action = step["action"]
-        target = step.get("target", "unknown")
+    def _record_history(self, workflow_run: Dict[str, Any]) -> None:
+        """Insert a finished run into history, keeping it ordered by start time"""
+        if len(self.workflow_history) >= _WORKFLOW_HISTORY_LIMIT:
+            oldest = self.workflow_history.popleft()
+            del self._history_by_id[oldest["id"]]
         
-        # Simulate different actions
-        if action == "send_alert":
-            return await self._send_alert(target, incident_data)
-        elif action == "create_channel":
-            return await self._create_communication_channel(target, incident_data)
-        elif action == "scale_service":
-            return await self._scale_service(target, incident_data)
-        elif action == "configure_cache":
-            return await self._configure_cache(target, incident_data)
-        elif action == "restart_service":
-            return await self._restart_service(target, incident_data)
-        elif action == "isolate_system":
-            return await self._isolate_system(target, incident_data)
-        elif action == "block_ip":
-            return await self._block_malicious_ips(target, incident_data)
-        elif action == "security_scan":
-            return await self._perform_security_scan(target, incident_data)
-        else:
-            return {"action": action, "status": "unknown_action", "target": target}
+        # Runs finish roughly in start order, so the slot is at or near the right end
+        position = len(self.workflow_history)
+        while position and self.workflow_history[position - 1]["started_at"] > workflow_run["started_at"]:
+            position -= 1
+        self.workflow_history.insert(position, workflow_run)
+        self._history_by_id[workflow_run["id"]] = workflow_run
+    
+    async def _run_step(self, step: Step, call: Callable, incident_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one step within its timeout and describe the outcome"""
+        try:
+            # timeout bounds the step; it is not a delay after it
+            async with self._step_slots:
+                step_result = await asyncio.wait_for(call(incident_data), timeout=step.timeout)
+        except Exception as e:
+            error = f"Step timed out after {step.timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+            logger.error("Workflow step %s failed: %s", step.name, error)
+            return {
+                "step_name": step.name,
+                "action": step.action,
+                "status": "failed",
+                "completed_at": datetime.now().isoformat(),
+                "error": error
+            }
+        
+        logger.info("Workflow step %s completed", step.name)
+        return {
+            "step_name": step.name,
+            "action": step.action,
+            "status": "completed",
+            "completed_at": datetime.now().isoformat(),
+            "result": step_result
+        }
+    
+    def _bind_step(self, step: Step, actions: Dict[str, Callable]) -> Callable:
+        """Bind a step's handler and target, leaving only the incident to supply"""
+        handler = actions.get(step.action)
+        if handler is None:
+            return functools.partial(self._unknown_action, step.action, step.target)
+        return functools.partial(handler, step.target)
+    
+    async def _unknown_action(self, action: str, target: str, incident_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result for a step whose action has no handler"""
+        return {"action": action, "status": "unknown_action", "target": target}
     
     async def _send_alert(self, target: str, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """Send alert notification"""
@@ -332,38 +370,25 @@ class WorkflowEngine:
     
     def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """Get status of workflow run"""
-        # Check active runs
-        for run in self.active_workflow_runs:
-            if run["id"] == workflow_id:
-                return run
-        
-        # Check history
-        for run in self.workflow_history:
-            if run["id"] == workflow_id:
-                return run
-        
-        return {"error": f"Workflow {workflow_id} not found"}
+        run = self.active_workflow_runs.get(workflow_id) or self._history_by_id.get(workflow_id)
+        if run is None:
+            return {"error": f"Workflow {workflow_id} not found"}
+        return run
     
-    def get_available_workflows(self) -> List[Dict[str, Any]]:
-        """Get list of available workflows"""
+    def match_workflows(self, event: Dict[str, Any]) -> List[str]:
+        """Names of workflows with at least one trigger matching the event"""
         return [
-            {
-                "name": name,
-                "description": workflow["description"],
-                "triggers": workflow["triggers"],
-                "auto_execute": workflow["auto_execute"],
-                "step_count": len(workflow["steps"])
-            }
-            for name, workflow in self.workflows.items()
+            name for name, predicates in self._trigger_predicates.items()
+            if any(predicate(event) for predicate in predicates)
         ]
     
+    def get_available_workflows(self) -> List[Dict[str, Any]]:
+        """Get list of available workflows"""
+        return self._available_workflows
+    
     def get_workflow_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get workflow execution history"""
-        return sorted(
-            self.workflow_history,
-            key=lambda x: x.get("started_at", ""),
-            reverse=True
-        )[:limit]
+        return list(itertools.islice(reversed(self.workflow_history), limit))
 
 # Global workflow engine instance
 workflow_engine = WorkflowEngine()